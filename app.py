@@ -1,31 +1,45 @@
 #!/usr/bin/env python3
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from youtube_transcript_api import YouTubeTranscriptApi
-from better_profanity import profanity
-from googleapiclient.discovery import build
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from urllib.parse import urlparse, parse_qs
-import pandas as pd
-from textblob import TextBlob
-import nltk
-nltk.download('punkt', quiet=True)
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lex_rank import LexRankSummarizer
-from sumy.utils import get_stop_words
+from urllib.parse import urlparse, parse_qs, quote
+from urllib.request import urlopen
+import json
 import os
 from dotenv import load_dotenv
 import re
 import logging
+from collections import Counter
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from cache import cached, get_cache
+from metrics import metrics, QUOTA_COSTS
+from fetchlayer import fetch_layer, FetchError
+import time
+
+# Heavy dependencies (tkinter, matplotlib, pandas, NLP and API clients) are imported where
+# they are first needed, so headless runs and `import app` start without loading them.
+tk = ttk = filedialog = messagebox = plt = pd = None
+TranscriptView = TableView = parse_timestamp = format_range = TkChart = chart_renderer = None
+
+def load_gui():
+    """Import the GUI libraries into module globals; called once before building the window"""
+    global tk, ttk, filedialog, messagebox, plt, pd, TranscriptView, TableView, parse_timestamp
+    global format_range, TkChart, chart_renderer
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from views import TranscriptView, TableView, parse_timestamp
+    from timeline import format_range
+    from charts import TkChart, chart_renderer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 API_KEY = os.getenv("q`YI", "YOUR_API_KEY")  # Replace with your actual key if not using .env
+# Optional alternative endpoints, e.g. the local stand-in server (standin.py)
+YOUTUBE_API_URL = os.getenv("YOUTUBE_API_URL")
+TRANSCRIPT_API_URL = os.getenv("TRANSCRIPT_API_URL")
 
 # Refined list of restricted keywords - more specific and context-aware
 restricted_keywords = [
@@ -40,26 +54,140 @@ restricted_keywords = [
     r"\briot\b(?! gear)", r"\bexplosion\b(?! fireworks)"
 ]
 
-# Define restricted channels, videos, and playlists
-RESTRICTED_CHANNEL_IDS = ["UC_UnqGamer"]  # Channel ID for UnqGamer
-RESTRICTED_VIDEO_IDS = ["NkZFnpDhdCk"]  # Specific video ID
-RESTRICTED_PLAYLIST_IDS = ["PL4Ng544E1TFTssjj8SdZbgE576EVVmjhp"]  # Specific playlist ID
+# Restricted channels, videos and playlists are listed in blocklists/ (loaded by blocklist.py)
+
+# A transcript is restricted with at least KEYWORD_THRESHOLD distinct keyword matches
+# or more than PROFANITY_THRESHOLD profane words
+KEYWORD_THRESHOLD = 1
+PROFANITY_THRESHOLD = 3
+
+class RestrictedContentMatcher:
+    """Scan text for all restricted keyword patterns in a single pass"""
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.labels = [pattern.strip(r'\b()') for pattern in self.patterns]
+        self.compiled = [re.compile(p) for p in self.patterns]
+        # Wrapping each alternative in a group defeats re's fast scanning, so the combined regex
+        # only finds where some pattern matches; the (rare) hits are attributed afterwards.
+        # When every pattern starts at a word boundary, only word starts need to be tried.
+        guard = r"\b(?=\w)" if all(p.startswith(r"\b") for p in self.patterns) else ""
+        self.regex = re.compile(guard + "(?:" + "|".join(self.patterns) + ")")
+
+    def scan(self, text):
+        """Return per-pattern hit counts and (pattern index, start, end) offsets into text.lower()"""
+        text = text.lower()
+        counts = [0] * len(self.patterns)
+        matches = []
+        for m in self.regex.finditer(text):
+            # Alternation picks the first pattern that matches here, so try them in the same order
+            for idx, rx in enumerate(self.compiled):
+                hit = rx.match(text, m.start())
+                if hit and hit.end() == m.end():
+                    break
+            else:
+                # The combined regex and the individual patterns disagree; don't credit a wrong one
+                logger.warning(f"Restricted-content match {m.group()!r} at {m.start()} fits no single pattern")
+                continue
+            counts[idx] += 1
+            matches.append((idx, m.start(), m.end()))
+        return counts, matches
+
+    def matched_labels(self, counts):
+        return [label for label, n in zip(self.labels, counts) if n]
+
+restricted_matcher = RestrictedContentMatcher(restricted_keywords)
+
+class ProfanityScorer:
+    """Count profane whitespace tokens in bulk, matching profanity.contains_profanity(token)"""
+    def __init__(self, censor=None):
+        from better_profanity import profanity
+        from better_profanity.constants import ALLOWED_CHARACTERS
+        censor = censor or profanity
+        if not censor.CENSOR_WORDSET:
+            censor.load_censor_words()
+        self.censor = censor
+        # Every variant of a censor word normalizes to the same key (characters that can stand in
+        # for a letter become "?"), so lookup is a dict hit plus an exact VaryingString comparison
+        substitutes = {c for variants in censor.CHARS_MAPPING.values() for c in variants}
+        self.normalize = str.maketrans({c: "?" for c in substitutes})
+        self.index = {}
+        for word in censor.CENSOR_WORDSET:
+            self.index.setdefault(str(word).translate(self.normalize), []).append(word)
+        self.allowed_run = re.compile("[" + "".join(re.escape(c) for c in sorted(ALLOWED_CHARACTERS)) + "]+")
+
+    def is_word_profane(self, word):
+        return any(w == word for w in self.index.get(word.translate(self.normalize), ()))
+
+    def is_profane(self, token):
+        runs = self.allowed_run.findall(token)
+        if not runs:
+            return False
+        if len(runs) == 1:
+            # A single word wrapped in punctuation is censored exactly when the word itself is
+            return self.is_word_profane(runs[0])
+        # Tokens like "hand-job" can form censor words across separators; defer to the library
+        return self.censor.contains_profanity(token)
+
+    def count(self, text):
+        """Number of profane whitespace tokens in text (case-insensitive)"""
+        tokens = Counter(text.lower().split())
+        return sum(n for token, n in tokens.items() if self.is_profane(token))
+
+    def positions(self, text):
+        """(start, end) offsets of each profane whitespace token in text.lower()"""
+        found, verdicts = [], {}
+        for m in re.finditer(r"\S+", text.lower()):
+            token = m.group()
+            if token not in verdicts:
+                verdicts[token] = self.is_profane(token)
+            if verdicts[token]:
+                found.append((m.start(), m.end()))
+        return found
+
+_profanity_scorer = None
+
+def get_profanity_scorer():
+    """Shared ProfanityScorer, built on first use (loading the wordlist takes a moment)"""
+    global _profanity_scorer
+    if _profanity_scorer is None:
+        _profanity_scorer = ProfanityScorer()
+    return _profanity_scorer
+
+def scan_restricted_content(text, matcher=None, with_positions=False, keyword_threshold=KEYWORD_THRESHOLD,
+                            profanity_threshold=PROFANITY_THRESHOLD):
+    """Run the restricted-content checks once and return the decision with its evidence.
+
+    with_positions also returns the offsets of profane words (for the timeline).
+    """
+    matcher = matcher or restricted_matcher
+    counts, matches = matcher.scan(text)
+    keyword_matches = sum(1 for n in counts if n)
+    if with_positions:
+        profanity_positions = get_profanity_scorer().positions(text)
+        profanity_score = len(profanity_positions)
+    else:
+        profanity_positions = None
+        profanity_score = get_profanity_scorer().count(text)
+
+    is_restricted = (keyword_matches >= keyword_threshold) or (profanity_score > profanity_threshold)
+    logger.debug(f"Keyword matches: {keyword_matches}, Profanity score: {profanity_score}, Restricted: {is_restricted}")
+    return {
+        "is_restricted": is_restricted,
+        "keyword_matches": keyword_matches,
+        "keyword_counts": counts,
+        "matches": matches,
+        "restricted_keywords": matcher.matched_labels(counts),
+        "profanity_score": profanity_score,
+        "profanity_positions": profanity_positions,
+    }
 
 def contains_violence_or_controversy(text):
     """Check for restricted content with context consideration"""
-    text_lower = text.lower()
-    keyword_matches = sum(1 for pattern in restricted_keywords if re.search(pattern, text_lower))
-    profanity_score = len([w for w in text_lower.split() if profanity.contains_profanity(w)])
-    
-    # Adjusted threshold: 1 keyword match or 3+ profanity instances
-    is_restricted = (keyword_matches >= 1) or (profanity_score > 3)
-    logger.debug(f"Keyword matches: {keyword_matches}, Profanity score: {profanity_score}, Restricted: {is_restricted}")
-    return is_restricted
+    return scan_restricted_content(text)["is_restricted"]
 
 def get_restricted_keywords(text):
     """Return list of matched restricted keywords for display"""
-    text_lower = text.lower()
-    return [pattern.strip(r'\b()') for pattern in restricted_keywords if re.search(pattern, text_lower)]
+    return restricted_matcher.matched_labels(restricted_matcher.scan(text)[0])
 
 def get_video_id(url):
     try:
@@ -85,95 +213,523 @@ def get_playlist_id(url):
         logger.error(f"Error parsing playlist ID: {e}")
         return None
 
-def fetch_transcript(vid, lang="en"):
+def get_channel_ref(url):
+    """("id", channel ID) or ("handle", "@name") for a channel URL, channel ID or @handle; None otherwise"""
+    value = url.strip()
+    if re.fullmatch(r"UC[\w-]{22}", value):
+        return ("id", value)
+    if re.fullmatch(r"@[\w.-]+", value):
+        return ("handle", value)
+    parsed = urlparse(value if "://" in value else f"https://{value}")
+    parts = [p for p in parsed.path.split("/") if p]
+    if parsed.hostname and parsed.hostname.endswith("youtube.com") and parts:
+        if parts[0] == "channel" and len(parts) > 1:
+            return ("id", parts[1])
+        if parts[0].startswith("@"):
+            return ("handle", parts[0])
+    return None
+
+class YouTubeClient:
+    """Long-lived YouTube Data API client shared by all fetches.
+
+    httplib2 connections are not thread-safe, so each thread builds its resource once and then
+    keeps reusing it (and its keep-alive connection) for every later request.
+    """
+    def __init__(self, api_key=None, api_url=None):
+        self.api_key = api_key or API_KEY
+        self.api_url = api_url or YOUTUBE_API_URL
+        self._local = threading.local()
+
+    def resource(self):
+        yt = getattr(self._local, "yt", None)
+        if yt is None:
+            import httplib2
+            from googleapiclient.discovery import build
+            options = {"api_endpoint": self.api_url} if self.api_url else None
+            yt = build("youtube", "v3", developerKey=self.api_key, cache_discovery=False, client_options=options,
+                       http=httplib2.Http(timeout=REQUEST_TIMEOUT))
+            self._local.yt = yt
+        return yt
+
+# Seconds before a single HTTP request is abandoned (and retried by the fetch layer)
+REQUEST_TIMEOUT = 30
+
+youtube_client = YouTubeClient()
+
+def configure_endpoints(api_url=None, transcript_url=None):
+    """Send API and transcript requests to other base URLs (None keeps the current setting)"""
+    global youtube_client, TRANSCRIPT_API_URL
+    if api_url:
+        youtube_client = YouTubeClient(api_url=api_url)
+    if transcript_url:
+        TRANSCRIPT_API_URL = transcript_url
+
+# videos.list accepts at most 50 IDs per call
+VIDEOS_LIST_MAX_IDS = 50
+
+def download_transcript(vid, lang):
+    """Transcript segments from TRANSCRIPT_API_URL if set, else from YouTube"""
+    if TRANSCRIPT_API_URL:
+        url = f"{TRANSCRIPT_API_URL.rstrip('/')}/transcript/{quote(vid)}?lang={quote(lang)}"
+        with urlopen(url, timeout=REQUEST_TIMEOUT) as resp:
+            return json.load(resp)
+    from youtube_transcript_api import YouTubeTranscriptApi
+    if hasattr(YouTubeTranscriptApi, "get_transcript"):
+        return YouTubeTranscriptApi.get_transcript(vid, languages=[lang])
+    # youtube-transcript-api 1.x replaced the class methods with instance methods
+    return YouTubeTranscriptApi().fetch(vid, languages=[lang]).to_raw_data()
+
+def request_transcript(vid, lang):
+    return fetch_layer.call("transcript", lambda: download_transcript(vid, lang))
+
+@metrics.timed("fetch_transcript")
+def fetch_transcript(vid, lang="en", refresh=False):
+    """(text, Transcript), or (None, None) if the video has no transcript; raises FetchError if fetching fails.
+
+    refresh=True skips the cached copy (and replaces it), for callers that must see edits.
+    """
+    lang = lang[:2].lower()
     try:
-        t = YouTubeTranscriptApi.get_transcript(vid, languages=[lang[:2].lower()])
-        text = " ".join([e['text'] for e in t])
-        logger.info(f"Successfully fetched transcript for video {vid}")
-        return text, t
-    except Exception as e:
-        logger.error(f"Failed to fetch transcript: {e}")
+        t = cached("transcript", f"{vid}:{lang}", lambda: request_transcript(vid, lang), refresh=refresh)
+    except FetchError as e:
+        if e.kind != "not_found":
+            logger.error(f"Failed to fetch transcript: {e}")
+            raise
+        logger.info(f"No transcript for video {vid}: {e.cause}")
+        return None, None
+    if not t:
         return None, None
+    # The cache keeps the provider's segment list; in memory it becomes one buffer and NumPy columns
+    from transcript import Transcript
+    transcript = Transcript.from_segments(t)
+    logger.info(f"Successfully fetched transcript for video {vid}")
+    return transcript.text, transcript
 
+ISO_DURATION = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+
+def parse_duration(value):
+    """Seconds in an ISO 8601 duration as used by contentDetails.duration (e.g. PT1H2M3S); None if unparseable"""
+    m = ISO_DURATION.fullmatch(value or "")
+    if not m:
+        return None
+    days, hours, minutes, seconds = (int(g or 0) for g in m.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def format_duration(seconds):
+    if seconds is None:
+        return "Unknown"
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60}:{rest % 60:02d}"
+
+def parse_video_item(item):
+    """Turn a videos.list item into the stats dict used throughout the app"""
+    stats, snip, content = item["statistics"], item["snippet"], item.get("contentDetails", {})
+    # Check YouTube's age restriction status
+    age_restricted = content.get("contentRating", {}).get("ytRating") == "ytAgeRestricted"
+    return {
+        "title": snip.get("title", "Unknown"),
+        "channel": snip.get("channelTitle", "Unknown"),
+        "channel_id": snip.get("channelId", ""),
+        "published_at": snip.get("publishedAt", ""),
+        "duration": parse_duration(content.get("duration")),
+        "likes": int(stats.get("likeCount", 0)),
+        "views": int(stats.get("viewCount", 0)),
+        "comments": int(stats.get("commentCount", 0)),
+        "age_restricted_by_youtube": age_restricted
+    }
+
+# Optional QuotaLimiter (quota.py) pacing all Data API calls; set with configure_quota
+quota_limiter = None
+
+def configure_quota(daily_units=None, burst=None):
+    """Pace API calls to daily_units quota units per day (None removes the limit)"""
+    global quota_limiter
+    from quota import QuotaLimiter
+    quota_limiter = QuotaLimiter(daily_units, burst) if daily_units else None
+
+def execute(method, request):
+    """Run a Data API request through the fetch layer, counting each attempt and its quota units"""
+    limiter = quota_limiter
+
+    def wait_for_quota():
+        start = time.perf_counter()
+        limiter.acquire(QUOTA_COSTS.get(method, 1))
+        metrics.incr("quota_wait_seconds", time.perf_counter() - start)
+
+    def attempt():
+        metrics.api_call(method)
+        with metrics.span(f"api.{method}"):
+            return request.execute()
+    # Tokens are taken before the endpoint's concurrency slot, and the wait does not use up the deadline
+    return fetch_layer.call(method, attempt, before=wait_for_quota if limiter else None)
+
+@metrics.timed("fetch_stats")
 def fetch_video_stats(vid):
-    try:
-        yt = build("youtube", "v3", developerKey=API_KEY)
-        resp = yt.videos().list(part="statistics,snippet,contentDetails", id=vid).execute()
+    """Stats dict, or None if the video does not exist or is private; raises FetchError if fetching fails"""
+    def request():
+        yt = youtube_client.resource()
+        resp = execute("videos.list", yt.videos().list(part="statistics,snippet,contentDetails", id=vid))
         if resp.get("items"):
-            item = resp["items"][0]
-            stats, snip, content = item["statistics"], item["snippet"], item.get("contentDetails", {})
-            # Check YouTube's age restriction status
-            age_restricted = content.get("contentRating", {}).get("ytRating") == "ytAgeRestricted"
-            return {
-                "title": snip.get("title", "Unknown"),
-                "channel": snip.get("channelTitle", "Unknown"),
-                "channel_id": snip.get("channelId", ""),
-                "likes": int(stats.get("likeCount", 0)),
-                "views": int(stats.get("viewCount", 0)),
-                "comments": int(stats.get("commentCount", 0)),
-                "age_restricted_by_youtube": age_restricted
-            }
+            return parse_video_item(resp["items"][0])
         return None
-    except Exception as e:
+    try:
+        return cached("stats", vid, request)
+    except FetchError as e:
         logger.error(f"Failed to fetch video stats: {e}")
-        return None
+        raise
+
+@metrics.timed("fetch_stats_many")
+def fetch_video_stats_many(ids):
+    """Fetch stats for many videos in videos.list calls of up to 50 IDs.
+
+    Returns {video_id: stats dict or None}; missing and private IDs map to None, and IDs
+    whose request failed are left out so callers can fall back to fetch_video_stats.
+    """
+    cache = get_cache()
+    result = {}
+    todo = []
+    for vid in dict.fromkeys(ids):
+        hit = cache.get("stats", vid) if cache else None
+        if hit is not None:
+            result[vid] = hit
+        else:
+            todo.append(vid)
+    yt = youtube_client.resource() if todo else None
+    for i in range(0, len(todo), VIDEOS_LIST_MAX_IDS):
+        chunk = todo[i:i + VIDEOS_LIST_MAX_IDS]
+        try:
+            resp = execute("videos.list", yt.videos().list(part="statistics,snippet,contentDetails",
+                                                           id=",".join(chunk), maxResults=VIDEOS_LIST_MAX_IDS))
+            found = {item["id"]: parse_video_item(item) for item in resp.get("items", [])}
+        except FetchError as e:
+            logger.error(f"Failed to fetch video stats for {len(chunk)} videos: {e}")
+            continue
+        for vid in chunk:
+            result[vid] = found.get(vid)
+            if cache and result[vid]:
+                cache.set("stats", vid, result[vid])
+    return result
+
+@metrics.timed("classify_transcript")
+def classify_transcript(txt, data=None):
+    """Classify an already fetched transcript.
+
+    With the segments (a Transcript, or a list of segment dicts whose " ".join is txt) the
+    result also carries the timeline: time ranges where restricted content occurs.
+    """
+    scan = scan_restricted_content(txt, with_positions=bool(data))
+    is_res = scan["is_restricted"]
+    found = scan["restricted_keywords"] if is_res else []
+    return {"age_restricted": is_res, "transcript": txt, "transcript_data": data, "restricted_keywords": found,
+            "keyword_counts": scan["keyword_counts"], "profanity_score": scan["profanity_score"], "timeline": transcript_timeline(data, scan) if data else []}
+
+def transcript_timeline(data, scan):
+    """Flagged time ranges for a transcript's segments, from an existing scan (no rescanning)"""
+    from timeline import TranscriptIndex, flagged_ranges
+    return flagged_ranges(TranscriptIndex(data), scan["matches"], restricted_matcher.labels,
+                          scan["profanity_positions"] or ())
 
 def analyze_transcript(vid, lang="en"):
     txt, data = fetch_transcript(vid, lang)
     if txt:
-        is_res = contains_violence_or_controversy(txt)
-        found = get_restricted_keywords(txt) if is_res else []
-        return {"age_restricted": is_res, "transcript": txt, "transcript_data": data, "restricted_keywords": found}
+        return classify_transcript(txt, data)
     return None
 
-def fetch_comments(vid):
+def get_restriction_sources(vid, stats, playlist_id=None):
+    """Return which blocklists (channel, video, playlist) mark this video as restricted.
+
+    The lists are the ID files in blocklists/ (see blocklist.py); edits are picked up while running.
+    """
+    from blocklist import get_blocklists
+    blocklists = get_blocklists()
+    sources = []
+    # Check channel
+    if blocklists.contains("channel", stats.get("channel_id")):
+        sources.append("channel")
+        logger.info(f"Video marked as restricted due to channel: {stats.get('channel')}")
+
+    # Check specific video
+    if blocklists.contains("video", vid):
+        sources.append("video")
+        logger.info(f"Video marked as restricted due to specific video ID: {vid}")
+
+    # Check playlist
+    if blocklists.contains("playlist", playlist_id):
+        sources.append("playlist")
+        logger.info(f"Video marked as restricted due to playlist ID: {playlist_id}")
+    return sources
+
+RESTRICTION_SOURCES = ("channel", "video", "playlist")
+
+def restriction_verdict(vid, stats, playlist_id=None, transcript_restricted=False):
+    """The restriction decision used by the GUI, batch, tracking and evaluate.py: (restricted, reasons).
+
+    reasons lists what restricts the video: the blocklists holding it (RESTRICTION_SOURCES),
+    "youtube" when YouTube age-restricts it and "transcript" when its transcript was flagged.
+    """
+    reasons = get_restriction_sources(vid, stats, playlist_id)
+    if stats.get("age_restricted_by_youtube", False):
+        reasons.append("youtube")
+    if transcript_restricted:
+        reasons.append("transcript")
+    return bool(reasons), reasons
+
+def blocklist_reasons(reasons):
+    """The blocklist sources among restriction_verdict's reasons"""
+    return [r for r in reasons if r in RESTRICTION_SOURCES]
+
+def fetch_uploads_playlist(channel):
+    """ID of a channel's uploads playlist; channel is a get_channel_ref tuple. None if not found."""
+    kind, value = channel
+    yt = youtube_client.resource()
+    params = {"id": value} if kind == "id" else {"forHandle": value}
+    resp = execute("channels.list", yt.channels().list(part="contentDetails", **params))
+    items = resp.get("items", [])
+    return items[0]["contentDetails"]["relatedPlaylists"]["uploads"] if items else None
+
+# playlistItems.list returns at most 50 items per page
+PLAYLIST_PAGE_SIZE = 50
+
+def iter_playlist_video_ids(playlist_id, max_videos=None):
+    """Yield the video IDs in a playlist page by page, following nextPageToken"""
+    token, count = None, 0
+    while True:
+        yt = youtube_client.resource()
+        resp = execute("playlistItems.list", yt.playlistItems().list(
+            part="contentDetails", playlistId=playlist_id, maxResults=PLAYLIST_PAGE_SIZE, pageToken=token))
+        items = resp.get("items", [])
+        for item in items:
+            yield item["contentDetails"]["videoId"]
+            count += 1
+            if max_videos and count >= max_videos:
+                return
+        token = resp.get("nextPageToken")
+        if not token or not items:
+            return
+
+# Comment budget per video; commentThreads.list returns at most 100 per page
+MAX_COMMENTS = 1000
+COMMENTS_PAGE_SIZE = 100
+
+_prefetch_pool = None
+
+def get_prefetch_pool():
+    """Shared threads that download the next comment page while the current one is processed.
+
+    Sized to the fetch layer's commentThreads.list limit, so that limit (not this pool)
+    is what caps concurrent comment requests.
+    """
+    global _prefetch_pool
+    if _prefetch_pool is None:
+        _prefetch_pool = ThreadPoolExecutor(max_workers=fetch_layer.limits.get("commentThreads.list", 8),
+                                            thread_name_prefix="comment-prefetch")
+    return _prefetch_pool
+
+def iter_comment_items(vid, max_comments=MAX_COMMENTS, max_pages=None, order="relevance", prefetch=True,
+                       executor=None):
+    """Yield commentThreads items one page at a time, following nextPageToken within the budget.
+
+    With prefetch=False the next page is only requested once the caller asks for it, so a
+    caller that stops early (e.g. at comments it has already seen) spends no extra quota.
+    Page requests run on executor, by default the shared prefetch pool.
+    """
+    def request(token, fetched):
+        size = COMMENTS_PAGE_SIZE if max_comments is None else min(COMMENTS_PAGE_SIZE, max_comments - fetched)
+        yt = youtube_client.resource()
+        return execute("commentThreads.list", yt.commentThreads().list(
+            part="snippet", videoId=vid, maxResults=size, pageToken=token, order=order))
+
+    pool = executor or get_prefetch_pool()
+    fetched = pages = 0
+    future = pool.submit(request, None, 0)
+    while future is not None:
+        resp = future.result()
+        items = resp.get("items", [])
+        fetched += len(items)
+        pages += 1
+        token = resp.get("nextPageToken")
+        more = (token and items and (max_comments is None or fetched < max_comments)
+                and (max_pages is None or pages < max_pages))
+        # Request the next page before handing this one over, so the two overlap
+        future = pool.submit(request, token, fetched) if more and prefetch else None
+        yield items
+        if more and not prefetch:
+            future = pool.submit(request, token, fetched)
+
+def comment_text(item):
+    return item["snippet"]["topLevelComment"]["snippet"]["textDisplay"]
+
+def iter_comment_pages(vid, max_comments=MAX_COMMENTS, max_pages=None, order="relevance"):
+    """Yield top-level comment texts one page at a time, following nextPageToken within the budget"""
+    for items in iter_comment_items(vid, max_comments, max_pages, order):
+        yield [comment_text(item) for item in items]
+
+def comments_cache_key(vid, max_comments, max_pages):
+    return f"{vid}:{max_comments}:{max_pages}"
+
+@metrics.timed("fetch_comments")
+def fetch_comments(vid, max_comments=MAX_COMMENTS, max_pages=None):
+    """Top-level comment texts ([] if comments are disabled); raises FetchError if fetching fails"""
+    def request():
+        return [c for page in iter_comment_pages(vid, max_comments, max_pages) for c in page]
     try:
-        yt = build("youtube", "v3", developerKey=API_KEY)
-        comms = []
-        resp = yt.commentThreads().list(part="snippet", videoId=vid, maxResults=100).execute()
-        for item in resp.get("items", []):
-            comms.append(item["snippet"]["topLevelComment"]["snippet"]["textDisplay"])
-        logger.info(f"Fetched {len(comms)} comments")
-        return comms
-    except Exception as e:
-        logger.error(f"Failed to fetch comments: {e}")
+        comms = cached("comments", comments_cache_key(vid, max_comments, max_pages), request) or []
+    except FetchError as e:
+        if e.kind != "not_found":
+            logger.error(f"Failed to fetch comments: {e}")
+            raise
+        logger.info(f"No comments for video {vid}: {e.cause}")
         return []
+    logger.info(f"Fetched {len(comms)} comments")
+    return comms
 
+@metrics.timed("comment_sentiment")
 def analyze_sentiment(comms):
-    analyzer = SentimentIntensityAnalyzer()
+    from sentiment import sentiment_engine
+    return sentiment_engine.counts(comms)
+
+def stream_comment_sentiment(vid, max_comments=MAX_COMMENTS, max_pages=None):
+    """Yield (comments seen, running sentiment counts) after each page of comments.
+
+    Stopping iteration stops the fetch. Comments come from the fetch cache (shared with
+    fetch_comments) when it has them; a stream that runs to the end is stored there.
+    Disabled comments end the stream; other fetch failures raise FetchError.
+    """
     counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
-    for c in comms:
-        s = analyzer.polarity_scores(c)
-        if s['compound'] >= 0.05:
-            counts["Positive"] += 1
-        elif s['compound'] <= -0.05:
-            counts["Negative"] += 1
-        else:
-            counts["Neutral"] += 1
-    return counts
+    seen = 0
+    cache = get_cache()
+    key = comments_cache_key(vid, max_comments, max_pages)
+    hit = cache.get("comments", key) if cache else None
+    if hit is not None:
+        pages = (hit[i:i + COMMENTS_PAGE_SIZE] for i in range(0, len(hit), COMMENTS_PAGE_SIZE))
+    else:
+        pages = iter_comment_pages(vid, max_comments, max_pages)
+    fetched = []
+    try:
+        for page in pages:
+            for label, n in analyze_sentiment(page).items():
+                counts[label] += n
+            seen += len(page)
+            if cache and hit is None:
+                fetched.extend(page)
+            yield seen, dict(counts)
+        # Only a complete stream is cached, since the key stands for the whole budget
+        if fetched:
+            cache.set("comments", key, fetched)
+    except FetchError as e:
+        if e.kind != "not_found":
+            logger.error(f"Failed to fetch comments after {seen}: {e}")
+            raise
+        logger.info(f"No comments for video {vid}: {e.cause}")
+
+def distribution_shift(prev, cur):
+    """Largest change in any sentiment share between two count dicts"""
+    prev_total, cur_total = sum(prev.values()) or 1, sum(cur.values()) or 1
+    return max(abs(cur[k] / cur_total - prev[k] / prev_total) for k in cur)
 
+def fetch_comment_sentiment(vid, max_comments=MAX_COMMENTS, max_pages=None, tolerance=None, min_comments=300,
+                            cancelled=None):
+    """Return (comments analyzed, sentiment counts), optionally stopping early once stable.
+
+    With tolerance set, fetching stops after min_comments once a page moves no share by more than it.
+    Setting the cancelled event stops fetching after the current page.
+    """
+    seen, counts = 0, {"Positive": 0, "Negative": 0, "Neutral": 0}
+    for n, running in stream_comment_sentiment(vid, max_comments, max_pages):
+        if cancelled is not None and cancelled.is_set():
+            break
+        stable = tolerance is not None and n >= min_comments and distribution_shift(counts, running) < tolerance
+        seen, counts = n, running
+        if stable:
+            logger.info(f"Comment sentiment stable after {n} comments")
+            break
+    logger.info(f"Analyzed sentiment of {seen} comments")
+    return seen, counts
+
+@metrics.timed("transcript_sentiment")
 def perform_textblob_sentiment_analysis(txt):
-    data = {'Sentence': [], 'Polarity': [], 'Sentiment': []}
-    for s in txt.split('.'):
-        if s.strip():
-            a = TextBlob(s)
-            p = a.sentiment.polarity
-            sent = 'Positive' if p > 0 else 'Negative' if p < 0 else 'Neutral'
-            data['Sentence'].append(s)
-            data['Polarity'].append(p)
-            data['Sentiment'].append(sent)
-    return pd.DataFrame(data)
+    from sentiment import transcript_sentiment
+    return transcript_sentiment(txt)
 
+@metrics.timed("extract_keywords")
 def extract_keywords(txt, count=10):
+    """The count most central transcript sentences (LexRank), in order of appearance"""
     try:
-        parser = PlaintextParser.from_string(txt, Tokenizer("english"))
-        summarizer = LexRankSummarizer()
-        summarizer.stop_words = get_stop_words("english")
-        return [str(s) for s in summarizer(parser.document, count)]
+        from keysentences import key_sentence_engine
+        return key_sentence_engine.extract(txt, count)
     except Exception as e:
         logger.error(f"Failed to extract keywords: {e}")
         return []
 
+class AnalysisRunner:
+    """Run analysis stages on worker threads and hand their results to the Tk thread.
+
+    Workers put (job id, stage, value, error) on a queue that the Tk loop polls with
+    root.after, so widgets are only touched from the main thread. Results from a job
+    that was cancelled or replaced by a newer one are dropped when they arrive. An
+    exception from handler is logged and passed to on_error(stage, exception); polling
+    carries on either way.
+    """
+    def __init__(self, root, handler, workers=4, poll_ms=50, on_error=None):
+        self.root = root
+        self.handler = handler
+        self.on_error = on_error
+        self.poll_ms = poll_ms
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+        self.results = queue.Queue()
+        self.job_id = 0
+        self.cancel_event = threading.Event()
+        self.pending = 0
+        self.root.after(self.poll_ms, self.poll)
+
+    @property
+    def running(self):
+        return self.pending > 0
+
+    def start(self):
+        self.cancel()
+        self.cancel_event = threading.Event()
+        return self.job_id
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.job_id += 1
+        self.pending = 0
+
+    def submit(self, name, fn, *args, **kwargs):
+        job_id, cancelled = self.job_id, self.cancel_event
+        self.pending += 1
+
+        def run():
+            if cancelled.is_set():
+                return
+            try:
+                with metrics.span(f"stage.{name}"):
+                    value = fn(*args, **kwargs)
+                self.results.put((job_id, name, value, None))
+            except Exception as e:
+                self.results.put((job_id, name, None, e))
+        self.pool.submit(run)
+
+    def poll(self):
+        try:
+            while True:
+                try:
+                    job_id, name, value, error = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                if job_id != self.job_id:
+                    continue  # stale result from a cancelled or superseded job
+                self.pending -= 1
+                try:
+                    self.handler(name, value, error)
+                except Exception as e:
+                    logger.exception(f"Failed to show the {name} result: {e}")
+                    if self.on_error:
+                        self.on_error(name, e)
+        finally:
+            self.root.after(self.poll_ms, self.poll)
+
 class YouTubeAnalyzerApp:
     def __init__(self, root):
         self.root = root
@@ -206,6 +762,17 @@ class YouTubeAnalyzerApp:
         self.res = None
         self.trans_data = None
         self.sent_df = None
+        self.key_sentences = None
+        self.timeline = []
+        self.stage_results = {}
+        self.stage_errors = {}
+        self.started = None
+        self.trans_view = None
+        self.sent_view = None
+        self.charts = {}  # chart kind -> TkChart, kept across analyses
+        self.chart_data = {}
+        self.runner = AnalysisRunner(root, self.on_stage_result,
+                                     on_error=lambda name, e: self.status_var.set(f"Could not show the {name} results: {e}"))
 
     def setup_styles(self):
         self.style = ttk.Style()
@@ -234,6 +801,12 @@ class YouTubeAnalyzerApp:
         tk.Button(self.input_cont, text="Analyze", command=self.analyze_video, bg=self.accent, fg="#000000", 
                  font=("Arial", 12, "bold"), padx=15, pady=5, activebackground=self.bg, activeforeground=self.accent, 
                  relief=tk.FLAT, cursor="hand2").pack(side=tk.RIGHT, padx=5)
+        tk.Button(self.input_cont, text="Cancel", command=self.cancel_analysis, bg=self.sec, fg=self.text_color, 
+                 font=("Arial", 12), padx=15, pady=5, activebackground=self.bg, activeforeground=self.accent, 
+                 relief=tk.FLAT, cursor="hand2").pack(side=tk.RIGHT, padx=5)
+        self.status_var = tk.StringVar()
+        tk.Label(self.input_cont, textvariable=self.status_var, font=("Arial", 11, "italic"), bg=self.sec, 
+                 fg=self.text_color).pack(side=tk.LEFT, padx=10)
         
         self.res_cont = tk.Frame(c, bg=self.bg)
         self.res_cont.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
@@ -242,26 +815,39 @@ class YouTubeAnalyzerApp:
         self.info_sec = tk.Frame(self.res_cont, bg=self.bg)
         self.info_sec.pack(fill=tk.X, pady=(0, 20))
 
-    def reset_analysis(self):
-        self.url_entry.delete(0, tk.END)
+    def clear_results(self):
         for sec in (self.info_sec, self.age_sec):
             for w in sec.winfo_children():
                 w.destroy()
+        chart_widgets = {chart.widget for chart in self.charts.values()}
         for tab in (self.sent_tab, self.trans_tab, self.trans_sent_tab, self.key_tab):
             for w in tab.winfo_children():
-                w.destroy()
+                if w in chart_widgets:
+                    w.pack_forget()
+                else:
+                    w.destroy()
+        self.chart_data = {}
+
+    def reset_analysis(self):
+        self.runner.cancel()
+        self.url_entry.delete(0, tk.END)
+        self.clear_results()
         self.res = None
         self.trans_data = None
         self.sent_df = None
-        self.root.update()
+        self.key_sentences = None
+        self.timeline = []
+        self.status_var.set("")
 
     def analyze_video(self):
-        for sec in (self.info_sec, self.age_sec):
-            for w in sec.winfo_children():
-                w.destroy()
-        for tab in (self.sent_tab, self.trans_tab, self.trans_sent_tab, self.key_tab):
-            for w in tab.winfo_children():
-                w.destroy()
+        # Starting a new job invalidates anything still in flight from the previous URL
+        self.runner.cancel()
+        self.clear_results()
+        self.res = None
+        self.trans_data = None
+        self.sent_df = None
+        self.key_sentences = None
+        self.timeline = []
         
         url = self.url_entry.get()
         if not url:
@@ -273,60 +859,104 @@ class YouTubeAnalyzerApp:
             messagebox.showerror("Error", "Invalid YouTube URL")
             return
         
-        stats = fetch_video_stats(vid)
-        if not stats:
-            messagebox.showerror("Error", "Video is unavailable or cannot be accessed. It may have been removed or restricted.")
-            return
-        
-        # Check if the video belongs to a restricted channel, video, or playlist
-        is_restricted_by_source = False
-        playlist_id = get_playlist_id(url)
-        
-        # Check channel
-        if stats.get("channel_id") in RESTRICTED_CHANNEL_IDS:
-            is_restricted_by_source = True
-            logger.info(f"Video marked as restricted due to channel: {stats.get('channel')}")
-        
-        # Check specific video
-        if vid in RESTRICTED_VIDEO_IDS:
-            is_restricted_by_source = True
-            logger.info(f"Video marked as restricted due to specific video ID: {vid}")
-        
-        # Check playlist
-        if playlist_id in RESTRICTED_PLAYLIST_IDS:
-            is_restricted_by_source = True
-            logger.info(f"Video marked as restricted due to playlist ID: {playlist_id}")
+        self.url, self.vid = url, vid
+        self.stage_results = {}
+        self.stage_errors = {}
+        lang = "en"  # Default to English
+        self.runner.start()
+        self.started = time.perf_counter()
+        # Stats, transcript and comments are independent, so they are fetched concurrently
+        self.runner.submit("stats", fetch_video_stats, vid)
+        self.runner.submit("transcript", analyze_transcript, vid, lang)
+        self.runner.submit("comments", fetch_comment_sentiment, vid, cancelled=self.runner.cancel_event)
+        self.status_var.set("Analyzing...")
+
+    def cancel_analysis(self):
+        if self.runner.running:
+            self.runner.cancel()
+            self.status_var.set("Analysis cancelled")
+
+    def on_stage_result(self, name, value, error):
+        """Render each stage's result as soon as it arrives (runs on the Tk thread)"""
+        with metrics.span(f"render.{name}"):
+            self.render_stage(name, value, error)
+        if not self.runner.running and self.started is not None:
+            metrics.record("analysis", time.perf_counter() - self.started)
+            self.started = None
+            logger.info(f"Analysis timings: {metrics.report()['stages']}")
+
+    def render_stage(self, name, value, error):
+        if error is not None:
+            logger.error(f"Analysis stage '{name}' failed: {error}")
+        self.stage_results[name] = value
+        self.stage_errors[name] = error
+        if name == "stats":
+            if error is not None:
+                self.runner.cancel()
+                self.clear_results()
+                self.status_var.set("")
+                messagebox.showerror("Error", f"Could not fetch video details from YouTube, please try again later.\n\n{error}")
+                return
+            if not value:
+                self.runner.cancel()
+                self.clear_results()
+                self.status_var.set("")
+                messagebox.showerror("Error", "Video is unavailable or cannot be accessed. It may have been removed or restricted.")
+                return
+            self.display_video_info(self.vid, value)
+        elif name == "transcript":
+            self.trans_data = value["transcript_data"] if value else []
+            self.timeline = value["timeline"] if value else []
+            self.init_trans_tab()
+            if value:
+                self.runner.submit("transcript_sentiment", perform_textblob_sentiment_analysis, value["transcript"])
+                self.runner.submit("keywords", extract_keywords, value["transcript"])
+            else:
+                self.sent_df = pd.DataFrame()
+                self.init_trans_sent_tab()
+        elif name == "keywords":
+            self.key_sentences = value or []
+            if self.res:
+                self.init_key_tab()
+        elif name == "transcript_sentiment":
+            self.sent_df = value if value is not None else pd.DataFrame()
+            self.init_trans_sent_tab()
+        elif name == "comments":
+            if error is not None:
+                tk.Label(self.sent_tab, text=f"Comments could not be fetched: {error}", font=("Arial", 12, "italic"),
+                         bg=self.bg, fg=self.error_color, wraplength=900).pack(pady=50)
+            else:
+                n_comms, sc = value or (0, {"Positive": 0, "Negative": 0, "Neutral": 0})
+                self.init_sent_tab(sc, n_comms)
         
-        self.display_video_info(vid, stats)
-        self.root.update()
+        if name in ("stats", "transcript") and "stats" in self.stage_results and "transcript" in self.stage_results:
+            self.show_verdict(self.stage_results["stats"], self.stage_results["transcript"])
         
-        lang = "en"  # Default to English
-        analysis = analyze_transcript(vid, lang)
+        if not self.runner.running:
+            self.status_var.set("Analysis complete")
+            messagebox.showinfo("Success", "Analysis completed successfully")
+
+    def show_verdict(self, stats, analysis):
+        # Blocklists, YouTube's own age restriction and the transcript analysis (if any)
+        is_res, reasons = restriction_verdict(self.vid, stats, get_playlist_id(self.url),
+                                              bool(analysis and analysis["age_restricted"]))
         if analysis is None:
-            # If transcript is unavailable, rely on YouTube's age restriction status or source-based restriction
-            is_res = is_restricted_by_source or stats.get("age_restricted_by_youtube", False)
-            self.res = {"age_restricted": is_res, "transcript": "", "transcript_data": [], "restricted_keywords": []}
+            self.res = {"age_restricted": is_res, "reasons": reasons, "transcript": "", "transcript_data": [],
+                        "restricted_keywords": []}
+            if self.stage_errors.get("transcript") is not None:
+                # Say so rather than presenting a metadata-only verdict as a full one
+                self.res["warning"] = "The transcript could not be fetched, so it was not checked."
         else:
-            # Combine transcript analysis with YouTube's age restriction status and source-based restriction
-            is_res = is_restricted_by_source or analysis["age_restricted"] or stats.get("age_restricted_by_youtube", False)
             self.res = analysis
             self.res["age_restricted"] = is_res
+            self.res["reasons"] = reasons
             self.res["title"] = stats["title"]  # Add title to res for use in key_tab
             self.res["channel"] = stats["channel"]  # Add channel to res for use in key_tab
+            self.res["published_at"] = stats.get("published_at", "")
+            self.res["duration"] = stats.get("duration")
         
-        self.trans_data = self.res["transcript_data"]
         self.display_age_restriction(self.res)
-        
-        comms = fetch_comments(vid)
-        sc = analyze_sentiment(comms)
-        self.sent_df = perform_textblob_sentiment_analysis(self.res["transcript"]) if self.res["transcript"] else pd.DataFrame()
-        
-        self.init_sent_tab(sc, len(comms))
-        self.init_trans_tab()
-        self.init_trans_sent_tab()
         self.init_key_tab()
-        self.root.update()
-        messagebox.showinfo("Success", "Analysis completed successfully")
 
     def display_video_info(self, vid, stats):
         card = tk.Frame(self.info_sec, bg=self.sec, padx=25, pady=20)
@@ -362,6 +992,9 @@ class YouTubeAnalyzerApp:
         st = "🚨🔞 This video is *not suitable for minors!*" if is_res else "✅🎉 This video is *safe for all viewers!*"
         tk.Label(msg_frame, text=st, font=("Arial", 12, "bold"), bg=self.sec, 
                  fg=self.error_color if is_res else self.success_color).pack()
+        if analysis.get("warning"):
+            tk.Label(msg_frame, text=f"⚠️ {analysis['warning']}", font=("Arial", 11), bg=self.sec,
+                     fg=self.error_color).pack()
 
         if is_res and keys:
             reason_card = tk.Frame(self.age_sec, bg=self.sec, padx=25, pady=15)
@@ -385,36 +1018,52 @@ class YouTubeAnalyzerApp:
                 tk.Label(r, text=kw, font=("Arial", 10), bg=self.bg, fg=self.error_color).pack()
                 cc += 1
 
+    def tab_chart(self, kind, tab):
+        """The tab's chart, created with its canvas on first use and updated in place afterwards"""
+        chart = self.charts.get(kind)
+        if chart is None:
+            chart = self.charts[kind] = TkChart(kind, tab)
+        return chart
+
+    def show_chart(self, kind, tab, container, *data, **pack):
+        self.chart_data[kind] = data
+        chart = self.tab_chart(kind, tab)
+        chart.update(*data)
+        chart.show(container, **pack)
+
+    def export_chart(self, kind):
+        """Save a chart as PNG or SVG; it is rendered on a worker thread"""
+        fp = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG image", "*.png"), ("SVG image", "*.svg")])
+        if not fp:
+            return
+        fmt = "svg" if fp.lower().endswith(".svg") else "png"
+        future = chart_renderer.submit(kind, *self.chart_data[kind], fmt=fmt)
+        self.root.after(50, self.finish_export, future, fp)
+
+    def finish_export(self, future, fp):
+        if not future.done():
+            self.root.after(50, self.finish_export, future, fp)
+            return
+        try:
+            with open(fp, 'wb') as f:
+                f.write(future.result())
+            messagebox.showinfo("Success", "Chart exported successfully")
+        except Exception as e:
+            logger.error(f"Failed to export chart: {e}")
+            messagebox.showerror("Error", f"Failed to export chart: {e}")
+
     def init_sent_tab(self, sc, cnt):
         cont = tk.Frame(self.sent_tab, bg=self.bg)
         cont.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-        tk.Label(cont, text="Video Statistics", font=("Arial", 18, "bold"), bg=self.bg, fg=self.accent).pack(pady=(0, 20))
+        tf = tk.Frame(cont, bg=self.bg)
+        tf.pack(fill=tk.X, pady=(0, 20))
+        tk.Label(tf, text="Video Statistics", font=("Arial", 18, "bold"), bg=self.bg, fg=self.accent).pack(side=tk.LEFT)
+        tk.Button(tf, text="Export Chart", command=lambda: self.export_chart("comments"), bg=self.accent, fg="#000000",
+                  font=("Arial", 11), padx=15, pady=5, relief=tk.FLAT).pack(side=tk.RIGHT)
         cs = tk.Frame(cont, bg=self.sec, padx=20, pady=20)
         cs.pack(fill=tk.BOTH, expand=True)
         tk.Label(cs, text=f"Comments Analysis ({cnt} comments)", font=("Arial", 14, "bold"), bg=self.sec, fg=self.text_color).pack(anchor="w", pady=(0,15))
-        fig = plt.Figure(figsize=(10, 4), dpi=100)
-        colors = {"Positive": "#4CAF50", "Negative": "#F44336", "Neutral": "#9E9E9E"}
-        ax1 = fig.add_subplot(121)
-        labs, vals = zip(*sc.items())
-        piecols = [colors[l] for l in labs]
-        ax1.pie(vals, autopct='%1.1f%%', startangle=90, colors=piecols, wedgeprops={'width': 0.6, 'edgecolor': 'w'},
-                textprops={'color': 'white', 'fontsize': 12})
-        ax1.set_title('Comment Sentiment Distribution', color='white', fontsize=14)
-        ax1.legend(loc="center left", bbox_to_anchor=(0.7, 0, 0.5, 1))
-        ax2 = fig.add_subplot(122)
-        barcols = [colors[l] for l in labs]
-        bars = ax2.bar(labs, vals, color=barcols, alpha=0.8, width=0.6)
-        ax2.set_title('Sentiment Counts', color='white', fontsize=14)
-        ax2.set_ylabel('Number of Comments', color='white', fontsize=12)
-        ax2.tick_params(colors='white')
-        ax2.grid(axis='y', alpha=0.3)
-        for bar in bars:
-            ax2.annotate(f'{bar.get_height()}', xy=(bar.get_x() + bar.get_width() / 2, bar.get_height()),
-                        xytext=(0, 3), textcoords="offset points", ha='center', va='bottom', color='white', fontsize=12)
-        fig.tight_layout(pad=3.0)
-        canvas = FigureCanvasTkAgg(fig, master=cs)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.show_chart("comments", self.sent_tab, cs, sc, fill=tk.BOTH, expand=True)
 
     def init_trans_tab(self):
         cont = tk.Frame(self.trans_tab, bg=self.bg)
@@ -425,6 +1074,8 @@ class YouTubeAnalyzerApp:
         frame = tk.Frame(cont, bg=self.sec, padx=20, pady=20)
         frame.pack(fill=tk.BOTH, expand=True)
         if self.trans_data and len(self.trans_data) > 0:
+            nav = tk.Frame(frame, bg=self.sec)
+            nav.pack(fill=tk.X, pady=(0, 10))
             view = tk.Frame(frame, bg=self.sec)
             view.pack(fill=tk.BOTH, expand=True)
             sbar = ttk.Scrollbar(view)
@@ -432,15 +1083,51 @@ class YouTubeAnalyzerApp:
             text = tk.Text(view, bg=self.bg, fg=self.text_color, font=("Arial", 11), padx=15, pady=15, wrap=tk.WORD,
                           selectbackground=self.accent, selectforeground="#000000", relief=tk.FLAT, height=20)
             text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            sbar.config(command=text.yview)
-            text.config(yscrollcommand=sbar.set)
-            for entry in self.trans_data:
-                sec = int(entry['start'])
-                text.insert(tk.END, f"[{sec//60:02d}:{sec%60:02d}] ", "ts")
-                text.insert(tk.END, f"{entry['text']}\n\n", "tx")
             text.tag_configure("ts", foreground=self.accent, font=("Arial", 10, "bold"))
             text.tag_configure("tx", foreground=self.text_color, spacing1=4)
-            text.config(state=tk.DISABLED)
+            # Segments are rendered a page at a time as the user scrolls
+            self.trans_view = TranscriptView(text, sbar, self.trans_data)
+            
+            search_entry = tk.Entry(nav, width=30, font=("Arial", 11), bg=self.bg, fg=self.text_color,
+                                    insertbackground=self.accent, relief=tk.FLAT)
+            search_entry.pack(side=tk.LEFT, padx=(0, 5))
+            def find_next(event=None):
+                if not self.trans_view.search(search_entry.get()):
+                    messagebox.showinfo("Search", f"'{search_entry.get()}' not found in transcript")
+            search_entry.bind("<Return>", find_next)
+            tk.Button(nav, text="Find", command=find_next, bg=self.accent, fg="#000000", font=("Arial", 10),
+                      padx=10, relief=tk.FLAT).pack(side=tk.LEFT)
+            time_entry = tk.Entry(nav, width=10, font=("Arial", 11), bg=self.bg, fg=self.text_color,
+                                  insertbackground=self.accent, relief=tk.FLAT)
+            def go_to_time(event=None):
+                seconds = parse_timestamp(time_entry.get())
+                if seconds is None:
+                    messagebox.showerror("Error", "Enter a time as mm:ss or hh:mm:ss")
+                    return
+                self.trans_view.jump_to_time(seconds)
+            time_entry.bind("<Return>", go_to_time)
+            tk.Button(nav, text="Go to time", command=go_to_time, bg=self.accent, fg="#000000", font=("Arial", 10),
+                      padx=10, relief=tk.FLAT).pack(side=tk.RIGHT)
+            time_entry.pack(side=tk.RIGHT, padx=5)
+            if self.timeline:
+                # Flagged time ranges; selecting one scrolls the transcript there
+                flags = tk.Frame(frame, bg=self.sec)
+                flags.pack(fill=tk.X, pady=(0, 10), before=view)
+                tk.Label(flags, text="Flagged:", font=("Arial", 11, "bold"), bg=self.sec, fg=self.accent).pack(side=tk.LEFT, anchor="n")
+                fbar = ttk.Scrollbar(flags)
+                fbar.pack(side=tk.RIGHT, fill=tk.Y)
+                ranges = tk.Listbox(flags, height=min(len(self.timeline), 4), bg=self.bg, fg=self.text_color,
+                                    font=("Arial", 10), selectbackground=self.accent, relief=tk.FLAT,
+                                    yscrollcommand=fbar.set)
+                fbar.config(command=ranges.yview)
+                ranges.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+                for r in self.timeline:
+                    ranges.insert(tk.END, format_range(r))
+                def go_to_flag(event=None):
+                    sel = ranges.curselection()
+                    if sel:
+                        self.trans_view.jump_to_time(self.timeline[sel[0]]["start"])
+                ranges.bind("<<ListboxSelect>>", go_to_flag)
             bf = tk.Frame(frame, bg=self.sec)
             bf.pack(fill=tk.X, pady=(15, 0))
             tk.Button(bf, text="Export Transcript", command=self.export_trans, bg=self.accent, fg="#000000", 
@@ -457,9 +1144,7 @@ class YouTubeAnalyzerApp:
             return
         try:
             with open(fp, 'w', encoding='utf-8') as f:
-                for e in self.trans_data:
-                    sec = int(e['start'])
-                    f.write(f"[{sec//60:02d}:{sec%60:02d}] {e['text']}\n\n")
+                self.trans_data.write_to(f)
             messagebox.showinfo("Success", "Transcript exported successfully")
         except Exception as e:
             logger.error(f"Failed to export transcript: {e}")
@@ -476,42 +1161,21 @@ class YouTubeAnalyzerApp:
         frame.pack(fill=tk.BOTH, expand=True)
         
         if not self.sent_df.empty:
-            # Sentiment distribution pie chart
-            fig = plt.Figure(figsize=(10, 4), dpi=100)
-            ax1 = fig.add_subplot(121)
-            sent_counts = self.sent_df['Sentiment'].value_counts()
-            colors = {"Positive": "#4CAF50", "Negative": "#F44336", "Neutral": "#9E9E9E"}
-            ax1.pie(sent_counts, labels=sent_counts.index, autopct='%1.1f%%', startangle=90, 
-                    colors=[colors[s] for s in sent_counts.index], wedgeprops={'width': 0.6, 'edgecolor': 'w'},
-                    textprops={'color': 'white', 'fontsize': 12})
-            ax1.set_title('Transcript Sentiment Distribution', color='white', fontsize=14)
-            
-            # Sentiment polarity bar chart
-            ax2 = fig.add_subplot(122)
-            avg_polarity = self.sent_df['Polarity'].mean()
-            ax2.bar(['Average Polarity'], [avg_polarity], color='#66B2FF', alpha=0.8, width=0.4)
-            ax2.set_ylim(-1, 1)
-            ax2.set_title('Average Sentiment Polarity', color='white', fontsize=14)
-            ax2.tick_params(colors='white')
-            ax2.grid(axis='y', alpha=0.3)
-            ax2.annotate(f'{avg_polarity:.2f}', xy=(0, avg_polarity), xytext=(0, 3 if avg_polarity >= 0 else -15), 
-                         textcoords="offset points", ha='center', va='bottom' if avg_polarity >= 0 else 'top', 
-                         color='white', fontsize=12)
-            fig.tight_layout(pad=3.0)
-            
-            canvas = FigureCanvasTkAgg(fig, master=frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=(0, 20))
+            tk.Button(tf, text="Export Chart", command=lambda: self.export_chart("transcript"), bg=self.accent,
+                      fg="#000000", font=("Arial", 11), padx=15, pady=5, relief=tk.FLAT).pack(side=tk.RIGHT)
+            # Sentiment distribution donut and average polarity bar
+            sent_counts = self.sent_df['Sentiment'].value_counts().to_dict()
+            avg_polarity = float(self.sent_df['Polarity'].mean())
+            self.show_chart("transcript", self.trans_sent_tab, frame, sent_counts, avg_polarity,
+                            fill=tk.BOTH, expand=True, pady=(0, 20))
             
             # Detailed sentiment table
             view = tk.Frame(frame, bg=self.sec)
             view.pack(fill=tk.BOTH, expand=True)
             sbar = ttk.Scrollbar(view, style='TScrollbar')
             sbar.pack(side=tk.RIGHT, fill=tk.Y)
-            tree = ttk.Treeview(view, columns=('Sentence', 'Polarity', 'Sentiment'), show='headings', 
-                               yscrollcommand=sbar.set, style='Treeview')
+            tree = ttk.Treeview(view, columns=('Sentence', 'Polarity', 'Sentiment'), show='headings', style='Treeview')
             tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            sbar.config(command=tree.yview)
             
             tree.heading('Sentence', text='Sentence', anchor='w')
             tree.heading('Polarity', text='Polarity', anchor='center')
@@ -520,13 +1184,20 @@ class YouTubeAnalyzerApp:
             tree.column('Polarity', width=100, anchor='center')
             tree.column('Sentiment', width=100, anchor='center')
             
-            for _, row in self.sent_df.iterrows():
-                tree.insert('', tk.END, values=(row['Sentence'], f"{row['Polarity']:.2f}", row['Sentiment']))
+            # Rows are sliced out of the column arrays a page at a time as the user scrolls; the
+            # categorical Sentiment column is passed as a view of its int8 codes and labelled per page
+            sentiment = self.sent_df['Sentiment'].array
+            labels = list(sentiment.categories)
+            columns = [self.sent_df['Sentence'].to_numpy(), self.sent_df['Polarity'].to_numpy(), sentiment.codes]
+            self.sent_view = TableView(tree, sbar, columns, formatters={1: lambda p: f"{p:.2f}", 2: labels.__getitem__})
         else:
             tk.Label(frame, text="No transcript available for sentiment analysis", 
                     font=("Arial", 12, "italic"), bg=self.sec, fg=self.text_color).pack(pady=50)
 
     def init_key_tab(self):
+        # Drawn once with the verdict and again when the key sentences arrive
+        for w in self.key_tab.winfo_children():
+            w.destroy()
         cont = tk.Frame(self.key_tab, bg=self.bg)
         cont.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         tf = tk.Frame(cont, bg=self.bg)
@@ -539,16 +1210,26 @@ class YouTubeAnalyzerApp:
         if self.res and self.res["transcript"]:
             tk.Label(frame, text=f"Title: {self.res['title']}", font=("Arial", 12), bg=self.sec, fg=self.text_color).pack(anchor="w", pady=5)
             tk.Label(frame, text=f"Channel: {self.res['channel']}", font=("Arial", 12), bg=self.sec, fg=self.text_color).pack(anchor="w", pady=5)
-            tk.Label(frame, text=f"Published: 2022-11-16", font=("Arial", 12), bg=self.sec, fg=self.text_color).pack(anchor="w", pady=5)
-            tk.Label(frame, text=f"Duration: 10:19", font=("Arial", 12), bg=self.sec, fg=self.text_color).pack(anchor="w", pady=5)
+            tk.Label(frame, text=f"Published: {self.res['published_at'][:10] or 'Unknown'}", font=("Arial", 12), bg=self.sec, fg=self.text_color).pack(anchor="w", pady=5)
+            tk.Label(frame, text=f"Duration: {format_duration(self.res['duration'])}", font=("Arial", 12), bg=self.sec, fg=self.text_color).pack(anchor="w", pady=5)
+            tk.Label(frame, text="Key Topics & Insights", font=("Arial", 14, "bold"), bg=self.sec, fg=self.accent).pack(anchor="w", pady=(15, 5))
+            if self.key_sentences is None:
+                tk.Label(frame, text="Extracting key sentences...", font=("Arial", 12, "italic"), bg=self.sec, fg=self.text_color).pack(anchor="w", pady=5)
+            elif not self.key_sentences:
+                tk.Label(frame, text="No key sentences found", font=("Arial", 12, "italic"), bg=self.sec, fg=self.text_color).pack(anchor="w", pady=5)
+            for i, sentence in enumerate(self.key_sentences or [], 1):
+                tk.Label(frame, text=f"{i}. {sentence}", font=("Arial", 11), bg=self.sec, fg=self.text_color,
+                         wraplength=900, justify=tk.LEFT).pack(anchor="w", pady=2)
         else:
             tk.Label(frame, text="No transcript available for topic extraction", 
                     font=("Arial", 12, "italic"), bg=self.sec, fg=self.text_color).pack(pady=50)
 
 def main():
+    load_gui()
     root = tk.Tk()
     app = YouTubeAnalyzerApp(root)
     root.mainloop()
+    metrics.write(os.getenv("YTA_METRICS_JSON"), os.getenv("YTA_METRICS_PROM"))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""Headless batch classification of the videos listed in a CSV file, playlists or channels.
+
+The input uses the same layout as youtube_video_classification.csv (a "Video URL"
+column, optionally "Actual Label"). Playlists and channel uploads are expanded page
+by page through playlistItems.list instead. Network fetches run on a bounded thread
+pool, classification runs on a process pool, and each result is appended to the
+output as soon as its video finishes, so memory stays flat however long the input is.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+from itertools import chain
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from cache import configure_cache, get_cache
+from metrics import metrics
+from fetchlayer import FetchError
+from app import (get_video_id, get_playlist_id, fetch_video_stats, fetch_video_stats_many, fetch_transcript,
+                 fetch_comments, classify_transcript, restriction_verdict, blocklist_reasons, restricted_keywords,
+                 configure_endpoints, configure_quota, get_channel_ref, fetch_uploads_playlist,
+                 iter_playlist_video_ids, VIDEOS_LIST_MAX_IDS)
+
+logger = logging.getLogger(__name__)
+
+RESULT_FIELDS = ["Video URL", "Actual Label", "Predicted Label", "video_id", "status", "title", "channel",
+                 "age_restricted_by_youtube", "restricted_sources", "restricted_keywords", "profanity_score",
+                 "flagged_ranges", "comment_count", "Positive", "Negative", "Neutral", "error"]
+
+def iter_input(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            url = (row.get("Video URL") or "").strip()
+            if url:
+                yield {"url": url, "actual": row.get("Actual Label", "")}
+
+def playlist_ref(value):
+    """Playlist ID from a playlist/watch URL or a bare playlist ID; None otherwise"""
+    value = value.strip()
+    if re.fullmatch(r"(PL|UU|LL|FL|OL|RD)[\w-]{10,}", value):
+        return value
+    return get_playlist_id(value)
+
+def iter_sources(playlists=(), channels=(), max_videos=None):
+    """Input items for every video in the given playlists and channels' uploads, fetched lazily"""
+    for value in channels:
+        ref = get_channel_ref(value)
+        uploads = None
+        try:
+            uploads = fetch_uploads_playlist(ref) if ref else None
+        except Exception as e:
+            logger.error(f"Failed to look up channel {value}: {e}")
+        if uploads:
+            logger.info(f"Expanding uploads of channel {value} (playlist {uploads})")
+            playlists = [*playlists, uploads]
+        else:
+            logger.error(f"Channel not found: {value}")
+    for value in playlists:
+        pid = playlist_ref(value)
+        if not pid:
+            logger.error(f"Not a playlist URL or ID: {value}")
+            continue
+        count = 0
+        try:
+            for vid in iter_playlist_video_ids(pid, max_videos):
+                count += 1
+                yield {"url": f"https://www.youtube.com/watch?v={vid}&list={pid}", "actual": "", "source": pid}
+        except Exception as e:
+            logger.error(f"Failed to list playlist {pid} after {count} videos: {e}")
+        logger.info(f"Playlist {pid}: {count} videos")
+
+def iter_chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def output_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return "jsonl" if path.endswith((".jsonl", ".json")) else "csv"
+
+def trim_partial_tail(path):
+    """Drop a half-written last line left behind by an interrupted run"""
+    with open(path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+def load_checkpoint(path, fmt):
+    """Return the URLs already present in an earlier run's output, except those that failed (to retry them)"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    trim_partial_tail(path)
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == "jsonl":
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    if row.get("status") != "error":
+                        done.add(row["Video URL"])
+        else:
+            for row in csv.DictReader(f):
+                if row.get("status") != "error":
+                    done.add(row["Video URL"])
+    return done
+
+class ResultWriter:
+    """Append result rows to CSV or JSONL, flushing each one so a crash loses at most one row"""
+    def __init__(self, path, fmt, append=False):
+        self.fmt = fmt
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self.f = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+        if fmt == "csv":
+            self.writer = csv.DictWriter(self.f, fieldnames=RESULT_FIELDS)
+            if not exists:
+                self.writer.writeheader()
+
+    def write(self, result):
+        if self.fmt == "jsonl":
+            self.f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        else:
+            from timeline import format_range
+            row = dict(result)
+            for key in ("restricted_sources", "restricted_keywords"):
+                row[key] = "; ".join(row.get(key) or [])
+            row["flagged_ranges"] = "; ".join(format_range(r) for r in row.get("flagged_ranges") or [])
+            self.writer.writerow({k: row.get(k, "") for k in RESULT_FIELDS})
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+@metrics.timed("batch.fetch")
+def fetch_video(item, lang="en", stats_lookup=None):
+    """Fetch everything needed to classify one video; runs on the I/O thread pool.
+
+    stats_lookup holds stats already fetched in bulk by fetch_video_stats_many.
+    """
+    record = dict(item, vid=get_video_id(item["url"]), status="ok")
+    if not record["vid"]:
+        record["status"] = "invalid_url"
+        return record
+    if stats_lookup is not None and record["vid"] in stats_lookup:
+        record["stats"] = stats_lookup[record["vid"]]
+    else:
+        record["stats"] = fetch_video_stats(record["vid"])
+    if not record["stats"]:
+        record["status"] = "unavailable"
+        return record
+    record["playlist_id"] = get_playlist_id(item["url"])
+    record["transcript"], record["transcript_data"] = fetch_transcript(record["vid"], lang)
+    try:
+        record["comments"] = fetch_comments(record["vid"])
+    except FetchError as e:
+        # The classification does not depend on comments, so keep it and leave the sentiment blank
+        record["comments"] = None
+        record["error"] = f"comments: {e}"
+    return record
+
+def base_result(record):
+    result = {"Video URL": record["url"], "Actual Label": record.get("actual", ""), "Predicted Label": "",
+              "video_id": record.get("vid") or "", "status": record["status"]}
+    if record.get("error"):
+        result["error"] = record["error"]
+    return result
+
+def classify_video(record, with_features=False):
+    """Run the classification stages on a fetched record; runs on the process pool.
+
+    with_features also puts the video's feature row (see features.py) under "features".
+    """
+    # NumPy, VADER and the feature code load here, in the workers, not on `import batch`
+    from sentiment import sentiment_engine, bucket_counts
+    result = base_result(record)
+    stats = record["stats"]
+    analysis = classify_transcript(record["transcript"], record.get("transcript_data")) if record.get("transcript") else None
+    is_res, reasons = restriction_verdict(record["vid"], stats, record.get("playlist_id"),
+                                          bool(analysis and analysis["age_restricted"]))
+    sources = blocklist_reasons(reasons)
+    result.update({
+        "Predicted Label": "Restricted" if is_res else "Safe",
+        "title": stats["title"],
+        "channel": stats["channel"],
+        "age_restricted_by_youtube": stats.get("age_restricted_by_youtube", False),
+        "restricted_sources": sources,
+        "restricted_keywords": analysis["restricted_keywords"] if analysis else [],
+        "profanity_score": analysis["profanity_score"] if analysis else 0,
+        "flagged_ranges": analysis["timeline"] if analysis else [],
+    })
+    comment_scores = None
+    if record["comments"] is not None:
+        comment_scores = sentiment_engine.scores(record["comments"])
+        result["comment_count"] = len(record["comments"])
+        result.update(bucket_counts(comment_scores))
+    if with_features:
+        from features import video_features
+        result["features"] = video_features(record["vid"], record.get("actual", ""), result["Predicted Label"], stats,
+                                            sources, analysis["keyword_counts"] if analysis else None,
+                                            result["profanity_score"], comment_scores)
+    return result
+
+def classify_in_worker(record, with_features=False):
+    """classify_video for the process pool; also returns the feature row and the metrics the worker recorded"""
+    with metrics.span("batch.classify"):
+        result = classify_video(record, with_features)
+    return result, result.pop("features", None), metrics.drain()
+
+class Aggregate:
+    """Running totals per source (playlist ID, or "input") and overall, for the end-of-run report"""
+    def __init__(self):
+        self.groups = defaultdict(lambda: {"videos": 0, "status": Counter(), "restricted": 0,
+                                           "sentiment": Counter(), "keywords": Counter(), "sources": Counter()})
+
+    def add(self, source, result):
+        for name in ("all", source):
+            g = self.groups[name]
+            g["videos"] += 1
+            g["status"][result["status"]] += 1
+            if result["status"] != "ok":
+                continue
+            g["restricted"] += result["Predicted Label"] == "Restricted"
+            g["sentiment"].update({k: result.get(k, 0) for k in ("Positive", "Negative", "Neutral")})
+            g["keywords"].update(result.get("restricted_keywords") or [])
+            g["sources"].update(result.get("restricted_sources") or [])
+
+    def report(self):
+        out = {}
+        for name, g in self.groups.items():
+            classified = g["status"]["ok"]
+            comments = sum(g["sentiment"].values())
+            out[name] = {
+                "videos": g["videos"],
+                "status": dict(g["status"]),
+                "restricted": g["restricted"],
+                "restricted_share": round(g["restricted"] / classified, 4) if classified else None,
+                "comments": comments,
+                "sentiment": dict(g["sentiment"]),
+                "sentiment_share": {k: round(n / comments, 4) for k, n in g["sentiment"].items()} if comments else {},
+                "top_keywords": g["keywords"].most_common(10),
+                "restriction_sources": dict(g["sources"]),
+            }
+        return out
+
+def run_batch(input_path, output_path, fmt=None, concurrency=8, workers=None, resume=False, lang="en",
+              items=None, report_path=None, features_path=None):
+    """Classify every URL in input_path (or the given input items), streaming results to output_path.
+
+    Returns the number written; the aggregate report is logged and optionally saved as JSON,
+    and with features_path every classified video's features are saved for features.py.
+    """
+    fmt = output_format(output_path, fmt)
+    done = load_checkpoint(output_path, fmt) if resume else set()
+    if done:
+        logger.info(f"Resuming: {len(done)} videos already in {output_path}")
+    writer = ResultWriter(output_path, fmt, append=resume)
+    if features_path:
+        from features import FeatureWriter
+    feature_writer = FeatureWriter(features_path, restricted_keywords, append=resume) if features_path else None
+    aggregate = Aggregate()
+    written = 0
+    # Cap in-flight work so neither pool queues up the whole input
+    max_in_flight = concurrency * 2
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as fetch_pool, \
+             ProcessPoolExecutor(max_workers=workers, initializer=metrics.reset) as classify_pool:
+            pending = {}  # future -> (stage, input item)
+
+            def drain():
+                nonlocal written
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    stage, item = pending.pop(fut)
+                    try:
+                        result = fut.result()
+                        if stage == "classify":
+                            result, features, worker_metrics = result
+                            metrics.merge(worker_metrics)
+                            if feature_writer:
+                                feature_writer.add(features)
+                    except Exception as e:
+                        logger.error(f"Failed to {stage} {item['url']}: {e}")
+                        result = base_result(dict(item, status="error", error=str(e)))
+                    else:
+                        if stage == "fetch":
+                            if result["status"] == "ok":
+                                pending[classify_pool.submit(classify_in_worker, result, bool(feature_writer))] = ("classify", item)
+                                continue
+                            result = base_result(result)
+                    writer.write(result)
+                    aggregate.add(item.get("source", "input"), result)
+                    written += 1
+                    if written % 100 == 0:
+                        logger.info(f"Classified {written} videos")
+
+            items = iter_input(input_path) if items is None else items
+            for chunk in iter_chunks((item for item in items if item["url"] not in done), VIDEOS_LIST_MAX_IDS):
+                # One videos.list call covers the stats for the whole chunk
+                stats_lookup = fetch_video_stats_many(filter(None, (get_video_id(item["url"]) for item in chunk)))
+                for item in chunk:
+                    while len(pending) >= max_in_flight:
+                        drain()
+                    pending[fetch_pool.submit(fetch_video, item, lang, stats_lookup)] = ("fetch", item)
+            while pending:
+                drain()
+    finally:
+        writer.close()
+        if feature_writer:
+            feature_writer.close()
+    logger.info(f"Wrote {written} results to {output_path}")
+    report = aggregate.report()
+    if "all" in report:
+        overall = report["all"]
+        logger.info(f"Restricted: {overall['restricted']} of {overall['status'].get('ok', 0)} classified "
+                    f"({overall['restricted_share']}); comment sentiment: {overall['sentiment_share']}")
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Wrote aggregate report to {report_path}")
+    cache = get_cache()
+    if cache:
+        logger.info(f"Cache stats: {cache.stats()}")
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify YouTube videos from a CSV, playlists or channels without the GUI")
+    parser.add_argument("input", nargs="?", help="CSV with a 'Video URL' column (see youtube_video_classification.csv)")
+    parser.add_argument("--playlist", action="append", default=[], help="playlist URL or ID to expand (repeatable)")
+    parser.add_argument("--channel", action="append", default=[],
+                        help="channel URL, ID or @handle whose uploads to expand (repeatable)")
+    parser.add_argument("--max-videos", type=int, help="per playlist or channel")
+    parser.add_argument("--daily-quota", type=int, help="pace API calls to this many quota units per day")
+    parser.add_argument("--quota-burst", type=int, help="quota units that may be spent at once (default: 1%% of daily)")
+    parser.add_argument("--report", help="write the aggregate report (restricted share, sentiment mix) as JSON")
+    parser.add_argument("--features", help="save per-video features (.npz) for re-scoring with features.py")
+    parser.add_argument("-o", "--output", required=True, help="results file (.csv or .jsonl)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="output format (default: from extension)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="max concurrent fetches")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="classification processes (default: CPU count)")
+    parser.add_argument("--resume", action="store_true", help="skip URLs already present in the output file")
+    parser.add_argument("--lang", default="en", help="transcript language")
+    parser.add_argument("--cache-path", help="fetch cache file (default: ~/.cache/youtube_analyzer/cache.sqlite3)")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the fetch cache")
+    parser.add_argument("--refresh-cache", action="store_true", help="refetch everything and overwrite cached entries")
+    parser.add_argument("--api-url", help="YouTube Data API base URL (e.g. the local stand-in, standin.py)")
+    parser.add_argument("--transcript-url", help="transcript provider base URL (e.g. the local stand-in)")
+    parser.add_argument("--metrics-json", help="write stage timings and counters as JSON")
+    parser.add_argument("--metrics-prom", help="write stage timings and counters in Prometheus text format")
+    parser.add_argument("--profile", action="append", default=[], metavar="STAGE",
+                        help="run STAGE under cProfile (repeatable, '*' for all; see metrics.py)")
+    args = parser.parse_args()
+    if not args.input and not (args.playlist or args.channel):
+        parser.error("give an input CSV or at least one --playlist / --channel")
+    configure_cache(enabled=not args.no_cache, refresh=args.refresh_cache, path=args.cache_path)
+    configure_endpoints(args.api_url, args.transcript_url)
+    configure_quota(args.daily_quota, args.quota_burst)
+    if args.profile:
+        # Also exported so classification workers started with spawn pick it up
+        os.environ["YTA_PROFILE"] = ",".join(args.profile)
+        metrics.profile_stages.update(args.profile)
+    with metrics.span("batch.run"):
+        items = chain(iter_input(args.input) if args.input else (),
+                      iter_sources(args.playlist, args.channel, args.max_videos))
+        run_batch(args.input, args.output, args.format, args.concurrency, args.workers, args.resume, args.lang,
+                  items, args.report, args.features)
+    metrics.write(args.metrics_json, args.metrics_prom)
+
+if __name__ == "__main__":
+    main()
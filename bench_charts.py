@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark: rebuilding the comment sentiment chart per analysis vs. updating one chart in place.
+
+Runs headless on the Agg canvas and reports time per analysis and the traced memory
+still held after each round of analyses (the rebuilt figures are kept alive, as the
+GUI's leaked figures were).
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from charts import CommentSentimentChart, COLORS, SENTIMENT_LABELS
+
+def make_counts(n, seed=0):
+    rng = random.Random(seed)
+    return [{label: rng.randint(0, 5000) for label in SENTIMENT_LABELS} for _ in range(n)]
+
+def rebuild(sc, keep):
+    """The original init_sent_tab: a new figure, artists and tight_layout every time"""
+    fig = Figure(figsize=(10, 4), dpi=100)
+    ax1 = fig.add_subplot(121)
+    labs, vals = zip(*sc.items())
+    ax1.pie(vals, autopct='%1.1f%%', startangle=90, colors=[COLORS[l] for l in labs],
+            wedgeprops={'width': 0.6, 'edgecolor': 'w'}, textprops={'color': 'white', 'fontsize': 12})
+    ax2 = fig.add_subplot(122)
+    bars = ax2.bar(labs, vals, color=[COLORS[l] for l in labs], alpha=0.8, width=0.6)
+    for bar in bars:
+        ax2.annotate(f'{bar.get_height()}', xy=(bar.get_x() + bar.get_width() / 2, bar.get_height()),
+                     xytext=(0, 3), textcoords="offset points", ha='center', va='bottom', color='white', fontsize=12)
+    fig.tight_layout(pad=3.0)
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    keep.append(canvas)
+
+def run(name, fn, counts, rounds):
+    fn(counts[0])  # warm up font and text caches
+    tracemalloc.start()
+    for r in range(rounds):
+        t0 = time.perf_counter()
+        for sc in counts:
+            fn(sc)
+        per = (time.perf_counter() - t0) / len(counts)
+        gc.collect()
+        print(f"{name:>10} round {r + 1}: {per * 1000:8.1f} ms/analysis  {tracemalloc.get_traced_memory()[0] / 1024:10.0f} KB held")
+    tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--analyses", type=int, default=20, help="analyses per round")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    counts = make_counts(args.analyses)
+
+    kept = []
+    run("rebuild", lambda sc: rebuild(sc, kept), counts, args.rounds)
+    chart = CommentSentimentChart()
+    canvas = FigureCanvasAgg(chart.figure)
+
+    def update(sc):
+        chart.update(sc)
+        canvas.draw()
+    run("in place", update, counts, args.rounds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-word better_profanity calls vs. the bulk ProfanityScorer"""
+import argparse
+import random
+import time
+from better_profanity import profanity
+from app import get_profanity_scorer
+
+def make_text(n_words, seed=0):
+    rng = random.Random(seed)
+    vocab = ("the video shows how we build a small cabin in the woods and talk about "
+             "everything that went wrong, right? honestly it was fun. well... maybe not").split()
+    swears = ["shit", "fuck,", "b1tch", "damn!", "a$$"]
+    return " ".join(rng.choice(swears) if rng.random() < 0.01 else rng.choice(vocab) for _ in range(n_words))
+
+def per_word_loop(text):
+    return len([w for w in text.lower().split() if profanity.contains_profanity(w)])
+
+def best_of(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = make_text(args.words)
+    old_t, old_score = best_of(per_word_loop, text, args.repeat)
+    new_t, new_score = best_of(get_profanity_scorer().count, text, args.repeat)
+    assert old_score == new_score, f"score mismatch: {old_score} != {new_score}"
+    print(f"{args.words} words, profanity score {new_score}")
+    print(f"per-word loop:   {old_t * 1000:9.1f} ms")
+    print(f"ProfanityScorer: {new_t * 1000:9.1f} ms  ({old_t / new_t:.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark: per-comment VADER loop vs. the batched SentimentEngine at 1k, 100k and 1M comments"""
+import argparse
+import random
+import time
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from sentiment import SentimentEngine
+
+PHRASES = ["love this video", "worst thing I have ever watched", "ok", "great explanation, thanks!",
+           "this is so boring", "who is here in 2024?", "absolutely terrible audio", "first", "amazing work :)",
+           "not bad at all", "I hate how long the intro is", "subscribed", "lol", "this made my day"]
+
+def make_comments(n, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(PHRASES, k=rng.randint(1, 3))) for _ in range(n)]
+
+def per_comment_loop(comms):
+    """The original analyze_sentiment: new analyzer, one comment at a time"""
+    analyzer = SentimentIntensityAnalyzer()
+    counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+    for c in comms:
+        s = analyzer.polarity_scores(c)
+        if s['compound'] >= 0.05:
+            counts["Positive"] += 1
+        elif s['compound'] <= -0.05:
+            counts["Negative"] += 1
+        else:
+            counts["Neutral"] += 1
+    return counts
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--workers", type=int, default=None, help="engine processes (default: CPU count)")
+    parser.add_argument("--baseline-max", type=int, default=100000,
+                        help="skip the slow per-comment loop above this many comments")
+    args = parser.parse_args()
+
+    engine = SentimentEngine(workers=args.workers)
+    engine.counts(make_comments(engine.parallel_threshold))  # start the pool outside the timings
+    print(f"{'comments':>10} {'loop (s)':>10} {'engine (s)':>11} {'speedup':>8}  counts")
+    for n in args.sizes:
+        comms = make_comments(n)
+        new_t, new_counts = timed(engine.counts, comms)
+        if n <= args.baseline_max:
+            old_t, old_counts = timed(per_comment_loop, comms)
+            assert old_counts == new_counts, f"count mismatch at {n}: {old_counts} != {new_counts}"
+            print(f"{n:>10} {old_t:>10.2f} {new_t:>11.2f} {old_t / new_t:>7.1f}x  {new_counts}")
+        else:
+            print(f"{n:>10} {'-':>10} {new_t:>11.2f} {'-':>8}  {new_counts}")
+    engine.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Startup-time guard: measure `import app` and `import batch` with `python -X importtime` and fail on regressions.
+
+Exits non-zero if an import takes longer than --max-ms or pulls in any of the
+heavy modules that must only load when their stage first runs.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["tkinter", "matplotlib", "pandas", "numpy", "textblob", "nltk", "sumy", "vaderSentiment", "scipy",
+                 "googleapiclient", "youtube_transcript_api", "better_profanity"]
+
+def import_profile(module):
+    """Return ({module: cumulative µs}, total µs) from one `-X importtime` run in a fresh interpreter"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cum_us, name = line.split(":", 1)[1].split("|")
+        cumulative[name.strip()] = int(cum_us)
+    return cumulative, cumulative.get(module, 0)
+
+def check(module, runs, max_ms, top):
+    """Print the import profile of module; True if it is over budget or loads a heavy module"""
+    totals, profile = [], {}
+    for _ in range(runs):
+        profile, total = import_profile(module)
+        totals.append(total / 1000)
+    median = statistics.median(totals)
+    print(f"import {module}: median {median:.1f} ms over {runs} runs (min {min(totals):.1f} ms)")
+    print("slowest imports (cumulative, last run):")
+    for name, us in sorted(profile.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    heavy = sorted({name.split(".")[0] for name in profile} & set(HEAVY_MODULES))
+    if heavy:
+        print(f"FAIL: heavy modules loaded by import {module}: {', '.join(heavy)}")
+        failed = True
+    if median > max_ms:
+        print(f"FAIL: median import time of {module} {median:.1f} ms exceeds budget of {max_ms:.0f} ms")
+        failed = True
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", nargs="+", default=["app", "batch"], help="modules to check")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=250.0, help="fail if the median import exceeds this")
+    parser.add_argument("--top", type=int, default=10, help="show the N slowest imports")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.module:
+        failed |= check(module, args.runs, args.max_ms, args.top)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark: memory and time of a transcript as a list of segment dicts vs. a Transcript.
+
+Builds synthetic transcripts of --segments segments and reports the memory
+held per transcript (tracemalloc), the pickled size sent to batch workers,
+and the time to export and to slice a time range.
+"""
+import argparse
+import io
+import pickle
+import random
+import time
+import tracemalloc
+from transcript import Transcript
+
+WORDS = "the a video and we so like this just really going know about right you people then what".split()
+
+def make_segments(n, seed=0):
+    rng = random.Random(seed)
+    segments, t = [], 0.0
+    for _ in range(n):
+        duration = round(rng.uniform(1.5, 6.0), 3)
+        segments.append({'text': " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))),
+                         'start': round(t, 3), 'duration': duration})
+        t += duration
+    return segments
+
+def held(build, raw):
+    tracemalloc.start()
+    value = build(raw)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+def export_dicts(segments):
+    f = io.StringIO()
+    for e in segments:
+        sec = int(e['start'])
+        f.write(f"[{sec//60:02d}:{sec%60:02d}] {e['text']}\n\n")
+    return f.getvalue()
+
+def export_transcript(transcript):
+    f = io.StringIO()
+    transcript.write_to(f)
+    return f.getvalue()
+
+def timed(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        value = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return value, best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=50000, help="segments per transcript")
+    args = parser.parse_args()
+    raw = make_segments(args.segments)
+    payload = pickle.dumps(raw)
+
+    # As fetch_transcript held them: the segment list plus the joined text
+    dicts, dicts_mem = held(lambda p: (lambda t: (" ".join(e['text'] for e in t), t))(pickle.loads(p)), payload)
+    transcript, transcript_mem = held(lambda p: Transcript.from_segments(pickle.loads(p)), payload)
+    print(f"{'':>12} {'held KB':>10} {'pickled KB':>11} {'export ms':>10} {'slice us':>9}")
+    exported_dicts, dicts_export = timed(export_dicts, dicts[1])
+    exported, transcript_export = timed(export_transcript, transcript)
+    assert exported == exported_dicts
+    mid = transcript.starts[len(transcript) // 2]
+    _, dicts_slice = timed(lambda: [e for e in dicts[1] if mid <= e['start'] < mid + 600])
+    _, transcript_slice = timed(transcript.between, mid, mid + 600)
+    print(f"{'dicts':>12} {dicts_mem / 1024:10.0f} {len(pickle.dumps(dicts)) / 1024:11.0f} "
+          f"{dicts_export * 1000:10.1f} {dicts_slice * 1e6:9.0f}")
+    print(f"{'Transcript':>12} {transcript_mem / 1024:10.0f} {len(pickle.dumps(transcript)) / 1024:11.0f} "
+          f"{transcript_export * 1000:10.1f} {transcript_slice * 1e6:9.0f}")
+
+if __name__ == "__main__":
+    main()
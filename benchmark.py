@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite for the analysis pipeline.
+
+Times each stage on synthetic (or recorded) transcripts and comment sets of
+several sizes, without any network access, and reports throughput, p50/p99
+latency and peak traced memory. Results can be saved as a JSON baseline and
+later runs compared against it to flag regressions.
+
+    python benchmark.py --save-baseline bench_baseline.json
+    python benchmark.py --baseline bench_baseline.json      # exits 1 on regression
+"""
+import argparse
+import glob
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import app
+
+SIZES = {"small": 1, "medium": 10, "large": 50}
+
+WORDS = ("so today we are going to look at how this works and why it matters for everyone who "
+         "watches the channel it is really great but the ending was a bit sad and honestly kind of "
+         "bad we also talk about the news the game and the weekend").split()
+RESTRICTED = ["murder", "drugs awareness", "blood", "shooting range", "violence", "explosion fireworks", "shit"]
+COMMENT_PHRASES = ["love this video", "worst thing I have ever watched", "ok", "great explanation, thanks!",
+                   "this is so boring", "first", "amazing work :)", "not bad at all", "lol", "this made my day"]
+URL_FORMS = ["https://www.youtube.com/watch?v={}", "https://youtu.be/{}", "{}",
+             "https://www.youtube.com/watch?v={}&list=PL4Ng544E1TFTssjj8SdZbgE576EVVmjhp", "https://example.com/{}"]
+
+def make_transcript(n_words, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n_words):
+        out.append(rng.choice(RESTRICTED) if rng.random() < 0.002 else rng.choice(WORDS))
+        if i % 12 == 11:
+            out[-1] += "."
+    return " ".join(out)
+
+def make_comments(n, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(COMMENT_PHRASES, k=rng.randint(1, 3))) for _ in range(n)]
+
+def make_urls(n, seed=0):
+    rng = random.Random(seed)
+    chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_"
+    return [rng.choice(URL_FORMS).format("".join(rng.choices(chars, k=11))) for _ in range(n)]
+
+def load_corpus(transcripts_glob, comments_path):
+    """Recorded inputs: transcript text files and a comments file with one comment per line"""
+    transcripts = {}
+    for path in sorted(glob.glob(transcripts_glob or "")):
+        with open(path, encoding="utf-8") as f:
+            transcripts[f"file:{path}"] = f.read()
+    comments = None
+    if comments_path:
+        with open(comments_path, encoding="utf-8") as f:
+            comments = [line.rstrip("\n") for line in f if line.strip()]
+    return transcripts, comments
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+def measure(fn, arg, repeat):
+    fn(arg)  # warm up caches and lazy imports
+    latencies = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        latencies.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    latencies.sort()
+    return latencies, peak
+
+def build_cases(sizes, transcripts, comments):
+    """(stage, size label, callable, input, work units, unit name) for every benchmark case"""
+    cases = []
+    for label in sizes:
+        scale = SIZES[label]
+        urls = make_urls(1000 * scale)
+        text = make_transcript(1000 * scale)
+        comms = make_comments(1000 * scale)
+        cases.append(("get_video_id", label, lambda us: [app.get_video_id(u) for u in us], urls, len(urls), "urls"))
+        for stage in ("contains_violence_or_controversy", "get_restricted_keywords",
+                      "perform_textblob_sentiment_analysis", "extract_keywords"):
+            cases.append((stage, label, getattr(app, stage), text, len(text.split()), "words"))
+        cases.append(("analyze_sentiment", label, app.analyze_sentiment, comms, len(comms), "comments"))
+    for label, text in transcripts.items():
+        for stage in ("contains_violence_or_controversy", "get_restricted_keywords",
+                      "perform_textblob_sentiment_analysis", "extract_keywords"):
+            cases.append((stage, label, getattr(app, stage), text, len(text.split()), "words"))
+    if comments:
+        cases.append(("analyze_sentiment", "file:comments", app.analyze_sentiment, comments, len(comments), "comments"))
+    return cases
+
+def run_suite(sizes, repeat, transcripts=None, comments=None):
+    results = {}
+    for stage, label, fn, arg, units, unit in build_cases(sizes, transcripts or {}, comments):
+        key = f"{stage}/{label}"
+        latencies, peak = measure(fn, arg, repeat)
+        p50 = percentile(latencies, 50)
+        results[key] = {
+            "units": units,
+            "unit": unit,
+            "p50_ms": p50 * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+            "throughput_per_s": units / p50 if p50 else float("inf"),
+            "peak_kb": peak / 1024,
+        }
+    return results
+
+def print_results(results):
+    print(f"{'stage/size':<50} {'p50 ms':>10} {'p99 ms':>10} {'throughput':>20} {'peak KB':>10}")
+    for key, r in results.items():
+        tput = f"{r['throughput_per_s']:,.0f} {r['unit']}/s"
+        print(f"{key:<50} {r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f} {tput:>20} {r['peak_kb']:>10.0f}")
+
+def compare(results, baseline, tolerance):
+    """Return the keys whose p50 or peak memory grew by more than tolerance over the baseline"""
+    regressions = []
+    for key, r in results.items():
+        base = baseline.get("results", {}).get(key)
+        if not base:
+            continue
+        for metric in ("p50_ms", "peak_kb"):
+            if base[metric] > 0 and r[metric] > base[metric] * (1 + tolerance):
+                regressions.append(key)
+                print(f"REGRESSION {key}: {metric} {base[metric]:.2f} -> {r[metric]:.2f} "
+                      f"(+{(r[metric] / base[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--transcripts", help="glob of recorded transcript .txt files to include")
+    parser.add_argument("--comments", help="recorded comments file, one comment per line")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("-o", "--output", help="write this run's results as JSON")
+    args = parser.parse_args()
+
+    transcripts, comments = load_corpus(args.transcripts, args.comments)
+    results = run_suite(args.sizes, args.repeat, transcripts, comments)
+    print_results(results)
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": args.repeat},
+        "results": results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {path}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
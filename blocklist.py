@@ -0,0 +1,220 @@
+"""Channel, video and playlist blocklists backed by memory-mapped sorted ID files.
+
+Each list is a text file with one ID per line (comments start with #). On
+first use it is compiled into an index file next to it: a small header and
+the deduplicated IDs sorted as fixed-width, NUL-padded records. Its name
+carries the source's mtime and size, so an edited list never matches a stale
+index. The index is memory-mapped read-only, so worker processes share one
+copy through the page cache, and membership is a binary search
+(np.searchsorted) over the records.
+
+A list notices when its text file changes (checked at most every
+check_interval seconds), recompiles it, and swaps in the new mapping with a
+single reference assignment; lookups in flight keep using the old one.
+Index files are written to a temporary name and renamed into place, so a
+reader never sees a partial file, and a new version never overwrites one that
+another process still has mapped. When the list's directory is not writable
+the index goes to ~/.cache/youtube_analyzer/blocklists instead, and if that
+fails too the sorted IDs are kept in memory; a failed load is logged, never
+raised into a lookup.
+"""
+import glob
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"YTBL"
+HEADER = struct.Struct("<4sHHQ")  # magic, version, record width, record count
+VERSION = 1
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "youtube_analyzer", "blocklists")
+DEFAULT_DIR = os.getenv("YTA_BLOCKLIST_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "blocklists"))
+LIST_FILES = {"channel": "channels.txt", "video": "videos.txt", "playlist": "playlists.txt"}
+
+def read_ids(path):
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.split(b"#", 1)[0].strip()
+            if line:
+                yield line
+
+def index_path(src, signature):
+    mtime_ns, size = signature
+    return f"{src}.{mtime_ns}-{size}.idx"
+
+def cache_index_prefix(src):
+    digest = hashlib.sha1(os.path.abspath(src).encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{os.path.basename(src)}.{digest}")
+
+def cache_index_path(src, signature):
+    """Index location under CACHE_DIR, for lists whose own directory is read-only"""
+    mtime_ns, size = signature
+    return f"{cache_index_prefix(src)}.{mtime_ns}-{size}.idx"
+
+def sorted_records(src):
+    """The deduplicated IDs of the list at src as a sorted fixed-width bytes array"""
+    ids = list(read_ids(src))
+    width = max((len(i) for i in ids), default=1)
+    return np.unique(np.array(ids, dtype=f"S{width}")) if ids else np.array([], dtype=f"S{width}")
+
+def compile_index(src, dst, records=None):
+    """Write the sorted, deduplicated index for the ID list at src to dst; returns dst"""
+    if records is None:
+        records = sorted_records(src)
+    width = records.dtype.itemsize
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, len(records)))
+        f.write(records.tobytes())
+    os.replace(tmp, dst)
+    logger.info(f"Compiled {len(records)} IDs from {src} into {dst}")
+    return dst
+
+class SortedIds:
+    """Membership test over a sorted fixed-width bytes array"""
+    def __init__(self, records):
+        self.records = records
+        self.width, self.count = records.dtype.itemsize, len(records)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, value):
+        if not self.count or not value:
+            return False
+        key = value.encode() if isinstance(value, str) else value
+        if len(key) > self.width:
+            return False
+        i = int(np.searchsorted(self.records, key))
+        return i < self.count and self.records[i] == key
+
+class SortedIdFile(SortedIds):
+    """Read-only view of one compiled index"""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, version, width, count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a blocklist index")
+            self.width, self.count = width, count
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if count else None
+        # Zero-copy array over the mapping
+        self.records = (np.frombuffer(self._mmap, dtype=f"S{width}", count=count, offset=HEADER.size)
+                        if count else np.array([], dtype=f"S{max(width, 1)}"))
+
+class Blocklist:
+    """One hot-reloading ID list; a missing source file is an empty list"""
+    def __init__(self, path, check_interval=5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked = 0.0
+        self._ids = None
+        self.reload()
+
+    def signature(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def reload(self):
+        """Load the list if its file changed since the last load; True if it was (re)loaded.
+
+        If the list cannot be read, the previous contents stay in use and a warning is logged.
+        """
+        with self._lock:
+            self._checked = time.monotonic()
+            sig = self.signature()
+            if sig == self._signature and self._ids is not None:
+                return False
+            try:
+                ids = self.load(sig) if sig is not None else None
+            except OSError as e:
+                logger.warning(f"Could not load blocklist {self.path}; keeping the previous contents: {e}")
+                return False
+            self._ids = ids  # atomic swap; readers holding the old view keep using it
+            self._signature = sig
+            logger.info(f"Loaded blocklist {self.path}: {len(ids) if ids else 0} IDs")
+            return True
+
+    def load(self, sig):
+        """The index next to the list, else one in CACHE_DIR, else the sorted IDs in memory"""
+        records = None
+        for index in (index_path(self.path, sig), cache_index_path(self.path, sig)):
+            try:
+                ids = SortedIdFile(index)
+            except FileNotFoundError:
+                ids = None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Rebuilding unreadable blocklist index {index}: {e}")
+                ids = None
+            if ids is None:
+                if records is None:
+                    records = sorted_records(self.path)
+                try:
+                    ids = SortedIdFile(compile_index(self.path, index, records))
+                except OSError as e:
+                    logger.warning(f"Cannot write blocklist index {index}: {e}")
+                    continue
+            self.remove_stale_indexes(index)
+            return ids
+        logger.warning(f"Keeping blocklist {self.path} in memory")
+        return SortedIds(records)
+
+    def remove_stale_indexes(self, keep):
+        """Best effort: an index another process still has mapped may not be removable yet"""
+        for path in glob.glob(glob.escape(self.path) + ".*.idx") + glob.glob(glob.escape(cache_index_prefix(self.path)) + ".*.idx"):
+            if path != keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def __contains__(self, value):
+        if time.monotonic() - self._checked >= self.check_interval:
+            self.reload()
+        ids = self._ids
+        return ids is not None and value in ids
+
+    def __len__(self):
+        return len(self._ids) if self._ids else 0
+
+class BlocklistStore:
+    """The channel, video and playlist blocklists in one directory"""
+    def __init__(self, directory=DEFAULT_DIR, check_interval=5.0):
+        self.directory = directory
+        self.lists = {kind: Blocklist(os.path.join(directory, name), check_interval) for kind, name in LIST_FILES.items()}
+
+    def contains(self, kind, value):
+        return value in self.lists[kind]
+
+_store = None
+
+def get_blocklists():
+    """Process-wide store for YTA_BLOCKLIST_DIR (default: blocklists/ next to this file), opened on first use"""
+    global _store
+    if _store is None:
+        _store = BlocklistStore()
+    return _store
+
+def main():
+    """python blocklist.py FILE...  -- compile ID lists ahead of time and print their sizes"""
+    logging.basicConfig(level=logging.INFO)
+    for path in sys.argv[1:]:
+        st = os.stat(path)
+        index = compile_index(path, index_path(path, (st.st_mtime_ns, st.st_size)))
+        print(f"{index}: {len(SortedIdFile(index))} IDs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""On-disk cache for transcripts, video stats and comments.
+
+Entries live in a single SQLite file keyed by (kind, key), where the key is the
+video ID plus language for transcripts. Each kind has its own TTL, and the file
+is kept under a byte budget by evicting least recently used entries.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "youtube_analyzer", "cache.sqlite3")
+
+# Seconds before an entry is considered stale: stats change by the minute, transcripts almost never
+DEFAULT_TTLS = {
+    "stats": 15 * 60,
+    "comments": 6 * 60 * 60,
+    "transcript": 30 * 24 * 60 * 60,
+}
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+class FetchCache:
+    """SQLite-backed TTL + LRU cache for fetched API data.
+
+    refresh=True skips reads (every lookup is a miss) but still stores what is fetched.
+    """
+    def __init__(self, path=DEFAULT_PATH, ttls=None, max_bytes=DEFAULT_MAX_BYTES, refresh=False):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.hits = {kind: 0 for kind in self.ttls}
+        self.misses = {kind: 0 for kind in self.ttls}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connect(self):
+        # A connection must not cross a fork, so reopen in each process
+        if self._conn is None or self._pid != os.getpid():
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, size INTEGER NOT NULL,
+                created REAL NOT NULL, accessed REAL NOT NULL, PRIMARY KEY (kind, key))""")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            self._conn, self._pid = conn, os.getpid()
+            self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        return self._conn
+
+    def get(self, kind, key, max_age=None):
+        """Return the cached value, or None if missing, expired or refreshing.
+
+        max_age (seconds) overrides the kind's TTL, e.g. float("inf") to accept stale entries.
+        """
+        if not self.refresh:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT value, created FROM entries WHERE kind=? AND key=?", (kind, key)).fetchone()
+                if row and time.time() - row[1] <= (self.ttls.get(kind, 0) if max_age is None else max_age):
+                    conn.execute("UPDATE entries SET accessed=? WHERE kind=? AND key=?", (time.time(), kind, key))
+                    conn.commit()
+                    self.hits[kind] = self.hits.get(kind, 0) + 1
+                    metrics.incr("cache_hits", kind=kind)
+                    return json.loads(zlib.decompress(row[0]))
+        self.misses[kind] = self.misses.get(kind, 0) + 1
+        metrics.incr("cache_misses", kind=kind)
+        return None
+
+    def set(self, kind, key, value):
+        blob = zlib.compress(json.dumps(value).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            old = conn.execute("SELECT size FROM entries WHERE kind=? AND key=?", (kind, key)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                         (kind, key, blob, len(blob), now, now))
+            self._size += len(blob) - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        """Drop expired entries, then least recently used ones, until under 90% of the budget"""
+        now = time.time()
+        for kind, ttl in self.ttls.items():
+            conn.execute("DELETE FROM entries WHERE kind=? AND created < ?", (kind, now - ttl))
+        target = self.max_bytes * 0.9
+        size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if size > target:
+            freed, cutoff = 0, None
+            for accessed, n in conn.execute("SELECT accessed, size FROM entries ORDER BY accessed"):
+                freed += n
+                cutoff = accessed
+                if size - freed <= target:
+                    break
+            conn.execute("DELETE FROM entries WHERE accessed <= ?", (cutoff,))
+        self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        logger.debug(f"Cache evicted down to {self._size} bytes")
+
+    def get_or_fetch(self, kind, key, fetch):
+        """Return the cached value or call fetch() and store a non-empty result"""
+        value = self.get(kind, key)
+        if value is None:
+            value = fetch()
+            if value:
+                self.set(kind, key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries")
+            conn.commit()
+            self._size = 0
+
+    def stats(self):
+        """Hit/miss counters per kind plus the current on-disk size"""
+        return {
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "bytes": self._size if self._conn is not None else None,
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+_default_cache = None
+
+def get_cache():
+    """Process-wide cache, opened on first use; None when disabled with YTA_CACHE=0"""
+    global _default_cache
+    if _default_cache is None and os.getenv("YTA_CACHE", "1") != "0":
+        _default_cache = FetchCache(os.getenv("YTA_CACHE_PATH", DEFAULT_PATH),
+                                    refresh=os.getenv("YTA_CACHE_REFRESH", "0") == "1")
+    return _default_cache or None
+
+def configure_cache(enabled=True, refresh=False, path=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Replace the process-wide cache (enabled=False bypasses it entirely)"""
+    global _default_cache
+    if _default_cache:
+        _default_cache.close()
+    _default_cache = FetchCache(path or os.getenv("YTA_CACHE_PATH", DEFAULT_PATH), max_bytes=max_bytes,
+                                refresh=refresh) if enabled else False
+    return _default_cache or None
+
+def cached(kind, key, fetch, refresh=False):
+    """Fetch through the process-wide cache, or directly when caching is disabled.
+
+    refresh=True always fetches, and stores the result over any cached entry.
+    """
+    cache = get_cache()
+    if not cache:
+        return fetch()
+    if not refresh:
+        return cache.get_or_fetch(kind, key, fetch)
+    value = fetch()
+    if value:
+        cache.set(kind, key, value)
+    return value
@@ -0,0 +1,166 @@
+"""Sentiment charts that are built once and updated in place.
+
+Each chart owns one matplotlib Figure whose pie wedges, bars and labels are
+created up front; update() only changes their geometry and text, so a new
+analysis costs the same time and memory as the last one. In the GUI a
+TkChart keeps one canvas per tab and redraws it with draw_idle. For
+headless reports, ChartRenderer draws the same charts to PNG or SVG bytes on
+a worker thread with its own figures, since a figure must not be drawn from
+two threads at once.
+"""
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from matplotlib.figure import Figure
+
+SENTIMENT_LABELS = ("Positive", "Negative", "Neutral")
+COLORS = {"Positive": "#4CAF50", "Negative": "#F44336", "Neutral": "#9E9E9E"}
+BACKGROUND = "#000000"
+FOREGROUND = "white"
+
+def new_figure():
+    # Colors are set explicitly rather than through a pyplot style, which is global state
+    fig = Figure(figsize=(10, 4), dpi=100, facecolor=BACKGROUND)
+    return fig, fig.add_subplot(121, facecolor=BACKGROUND), fig.add_subplot(122, facecolor=BACKGROUND)
+
+def style_axes(ax, title, ylabel=None):
+    ax.set_title(title, color=FOREGROUND, fontsize=14)
+    if ylabel:
+        ax.set_ylabel(ylabel, color=FOREGROUND, fontsize=12)
+    ax.tick_params(colors=FOREGROUND)
+    for spine in ax.spines.values():
+        spine.set_color(FOREGROUND)
+    ax.grid(axis='y', alpha=0.3)
+
+class Donut:
+    """Pie wedges with percentage labels; hidden when their value is zero"""
+    def __init__(self, ax, labels, show_labels=False):
+        self.wedges, self.labels, self.pcts = ax.pie(
+            [1] * len(labels), labels=labels if show_labels else None, autopct='%1.1f%%', startangle=90,
+            colors=[COLORS[l] for l in labels], wedgeprops={'width': 0.6, 'edgecolor': 'w'},
+            textprops={'color': FOREGROUND, 'fontsize': 12})
+        if not show_labels:
+            self.labels = [None] * len(labels)
+
+    def update(self, values):
+        total = float(sum(values))
+        theta = 90.0
+        for wedge, label, pct, value in zip(self.wedges, self.labels, self.pcts, values):
+            visible = total > 0 and value > 0
+            for artist in (wedge, label, pct):
+                if artist is not None:
+                    artist.set_visible(visible)
+            if not visible:
+                continue
+            span = 360.0 * value / total
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + span)
+            mid = np.deg2rad(theta + span / 2)
+            x, y = np.cos(mid), np.sin(mid)
+            # Same placement as Axes.pie: pctdistance 0.6, labeldistance 1.1
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f"{100 * value / total:.1f}%")
+            if label is not None:
+                label.set_position((1.1 * x, 1.1 * y))
+                label.set_horizontalalignment("left" if x >= 0 else "right")
+            theta += span
+
+class CommentSentimentChart:
+    """Comment sentiment: share donut and count bars"""
+    def __init__(self):
+        self.figure, pie_ax, self.bar_ax = new_figure()
+        self.donut = Donut(pie_ax, SENTIMENT_LABELS)
+        pie_ax.set_title('Comment Sentiment Distribution', color=FOREGROUND, fontsize=14)
+        pie_ax.legend(self.donut.wedges, SENTIMENT_LABELS, loc="center left", bbox_to_anchor=(0.7, 0, 0.5, 1),
+                      facecolor=BACKGROUND, labelcolor=FOREGROUND)
+        self.bars = self.bar_ax.bar(SENTIMENT_LABELS, [0] * len(SENTIMENT_LABELS),
+                                    color=[COLORS[l] for l in SENTIMENT_LABELS], alpha=0.8, width=0.6)
+        self.counts = [self.bar_ax.annotate("", xy=(bar.get_x() + bar.get_width() / 2, 0), xytext=(0, 3),
+                                            textcoords="offset points", ha='center', va='bottom',
+                                            color=FOREGROUND, fontsize=12) for bar in self.bars]
+        style_axes(self.bar_ax, 'Sentiment Counts', 'Number of Comments')
+        self.figure.tight_layout(pad=3.0)
+
+    def update(self, counts):
+        """counts maps Positive/Negative/Neutral to a number of comments"""
+        values = [counts.get(l, 0) for l in SENTIMENT_LABELS]
+        self.donut.update(values)
+        for bar, note, value in zip(self.bars, self.counts, values):
+            bar.set_height(value)
+            note.xy = (bar.get_x() + bar.get_width() / 2, value)
+            note.set_text(f"{value}")
+        self.bar_ax.set_ylim(0, max(max(values) * 1.15, 1))
+
+class TranscriptSentimentChart:
+    """Transcript sentence sentiment: share donut and average polarity"""
+    def __init__(self):
+        self.figure, pie_ax, self.bar_ax = new_figure()
+        self.donut = Donut(pie_ax, SENTIMENT_LABELS, show_labels=True)
+        pie_ax.set_title('Transcript Sentiment Distribution', color=FOREGROUND, fontsize=14)
+        self.bar, = self.bar_ax.bar(['Average Polarity'], [0], color='#66B2FF', alpha=0.8, width=0.4)
+        self.note = self.bar_ax.annotate("", xy=(0, 0), xytext=(0, 3), textcoords="offset points", ha='center',
+                                         va='bottom', color=FOREGROUND, fontsize=12)
+        self.bar_ax.set_ylim(-1, 1)
+        style_axes(self.bar_ax, 'Average Sentiment Polarity')
+        self.figure.tight_layout(pad=3.0)
+
+    def update(self, counts, avg_polarity):
+        """counts maps Positive/Negative/Neutral to a number of sentences"""
+        self.donut.update([counts.get(l, 0) for l in SENTIMENT_LABELS])
+        self.bar.set_height(avg_polarity)
+        self.note.xy = (0, avg_polarity)
+        self.note.xyann = (0, 3 if avg_polarity >= 0 else -15)
+        self.note.set_verticalalignment('bottom' if avg_polarity >= 0 else 'top')
+        self.note.set_text(f"{avg_polarity:.2f}")
+
+CHARTS = {"comments": CommentSentimentChart, "transcript": TranscriptSentimentChart}
+
+class TkChart:
+    """A chart and its Tk canvas, created once; the canvas widget is re-packed into each new layout"""
+    def __init__(self, kind, master):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.chart = CHARTS[kind]()
+        self.canvas = FigureCanvasTkAgg(self.chart.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+
+    def show(self, container, **pack):
+        """Pack the canvas into container, which must be inside the canvas's master"""
+        self.widget.pack(in_=container, **pack)
+        self.widget.lift(container)
+
+    def update(self, *data):
+        self.chart.update(*data)
+        self.canvas.draw_idle()
+
+class ChartRenderer:
+    """Renders charts to image bytes on one worker thread, reusing a figure per chart kind"""
+    def __init__(self):
+        self._executor = None
+        self._charts = {}
+        self._lock = threading.Lock()
+
+    def render(self, kind, *data, fmt="png", dpi=100):
+        """Image bytes (fmt is any format savefig accepts, e.g. png or svg); call from the worker only"""
+        chart = self._charts.get(kind)
+        if chart is None:
+            chart = self._charts[kind] = CHARTS[kind]()
+        chart.update(*data)
+        buf = io.BytesIO()
+        chart.figure.savefig(buf, format=fmt, dpi=dpi, facecolor=chart.figure.get_facecolor())
+        return buf.getvalue()
+
+    def submit(self, kind, *data, fmt="png", dpi=100):
+        """Render on the worker thread; returns a Future with the image bytes"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="charts")
+            return self._executor.submit(self.render, kind, *data, fmt=fmt, dpi=dpi)
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+chart_renderer = ChartRenderer()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Score the current classifier against a labeled list of videos.
+
+Every URL in a CSV with "Video URL" and "Actual Label" columns (the layout of
+youtube_video_classification.csv) is re-classified with the current keyword
+list, thresholds and blocklists. Stats and transcripts come from a fixture
+directory (the standin.py layout) or from the fetch cache, so no API calls are
+made and thousands of videos score in seconds on a process pool. Accuracy,
+precision, recall and F1 are computed from the confusion matrix and written,
+with every video's prediction and evidence, to a JSON results file.
+
+    python evaluate.py youtube_video_classification.csv --fixtures fixtures -o evaluation.json
+    python evaluate.py labels.csv --profanity-threshold 5 --keywords keywords.txt -o try.json
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LABELS = ["Safe", "Restricted"]
+
+def iter_labeled(path):
+    """{url, actual} for every row with a known label; rows without one are skipped"""
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            url = (row.get("Video URL") or "").strip()
+            actual = (row.get("Actual Label") or "").strip()
+            if url and actual in LABELS:
+                yield {"url": url, "actual": actual}
+
+def read_keywords(path):
+    """Keyword patterns, one regex per line (blank lines and lines starting with # are ignored)"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+class FixtureSource:
+    """Stats and transcripts from fixture files (see standin.py)"""
+    def __init__(self, root):
+        from standin import FixtureStore
+        self.store = FixtureStore(root)
+
+    def stats(self, vid):
+        from app import parse_video_item
+        item = self.store.load("videos", vid)
+        return parse_video_item(item) if item else None
+
+    def transcript(self, vid, lang):
+        return self.store.load("transcripts", f"{vid}.{lang}")
+
+class CacheSource:
+    """Stats and transcripts from the fetch cache, however old; fetch=True fetches misses (and caches them)"""
+    def __init__(self, path=None, fetch=False):
+        from cache import FetchCache, DEFAULT_PATH
+        self.cache = FetchCache(path or os.getenv("YTA_CACHE_PATH", DEFAULT_PATH))
+        self.fetch = fetch
+
+    def stats(self, vid):
+        value = self.cache.get("stats", vid, max_age=float("inf"))
+        if value is None and self.fetch:
+            from app import fetch_video_stats
+            value = fetch_video_stats(vid)
+        return value
+
+    def transcript(self, vid, lang):
+        value = self.cache.get("transcript", f"{vid}:{lang}", max_age=float("inf"))
+        if value is None and self.fetch:
+            from app import fetch_transcript
+            value = fetch_transcript(vid, lang)[1]
+        return value
+
+class Scorer:
+    """Re-runs the restriction decision for one labeled video"""
+    def __init__(self, source, lang="en", keywords=None, keyword_threshold=None, profanity_threshold=None,
+                 with_features=False):
+        import app
+        self.source = source
+        self.lang = lang[:2].lower()
+        self.matcher = app.RestrictedContentMatcher(keywords) if keywords else app.restricted_matcher
+        self.keyword_threshold = app.KEYWORD_THRESHOLD if keyword_threshold is None else keyword_threshold
+        self.profanity_threshold = app.PROFANITY_THRESHOLD if profanity_threshold is None else profanity_threshold
+        self.with_features = with_features
+
+    def evaluate(self, item):
+        from app import get_video_id, get_playlist_id, restriction_verdict, blocklist_reasons, scan_restricted_content
+        row = {"url": item["url"], "actual": item["actual"], "predicted": "", "video_id": get_video_id(item["url"])}
+        if not row["video_id"]:
+            return dict(row, status="invalid_url")
+        try:
+            stats = self.source.stats(row["video_id"])
+            if not stats:
+                return dict(row, status="missing")
+            segments = self.source.transcript(row["video_id"], self.lang)
+        except Exception as e:
+            return dict(row, status="error", error=str(e))
+        scan = None
+        if segments:
+            scan = scan_restricted_content(" ".join(e["text"] for e in segments), self.matcher,
+                                           keyword_threshold=self.keyword_threshold,
+                                           profanity_threshold=self.profanity_threshold)
+        is_res, reasons = restriction_verdict(row["video_id"], stats, get_playlist_id(item["url"]),
+                                              bool(scan and scan["is_restricted"]))
+        sources = blocklist_reasons(reasons)
+        row.update({
+            "status": "ok",
+            "predicted": LABELS[is_res],
+            "has_transcript": bool(segments),
+            "age_restricted_by_youtube": stats.get("age_restricted_by_youtube", False),
+            "restricted_sources": sources,
+            "restricted_keywords": scan["restricted_keywords"] if scan else [],
+            "keyword_matches": scan["keyword_matches"] if scan else 0,
+            "profanity_score": scan["profanity_score"] if scan else 0,
+        })
+        if self.with_features:
+            from features import video_features
+            row["features"] = video_features(row["video_id"], row["actual"], row["predicted"], stats, sources,
+                                             scan["keyword_counts"] if scan else None, row["profanity_score"])
+        return row
+
+_scorer = None
+
+def init_worker(source_args, scorer_args):
+    global _scorer
+    fixtures, cache_path, fetch = source_args
+    if fetch:
+        from cache import configure_cache
+        configure_cache(path=cache_path)
+    source = FixtureSource(fixtures) if fixtures else CacheSource(cache_path, fetch)
+    _scorer = Scorer(source, *scorer_args)
+
+def evaluate_in_worker(item):
+    return _scorer.evaluate(item)
+
+def confusion_matrix(y_true, y_pred, n_classes=len(LABELS)):
+    """Counts with actual classes as rows and predicted classes as columns"""
+    y_true, y_pred = np.asarray(y_true, dtype=np.int64), np.asarray(y_pred, dtype=np.int64)
+    return np.bincount(y_true * n_classes + y_pred, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+def scores(cm, labels=LABELS):
+    """Accuracy plus per-class, macro and support-weighted precision, recall and F1 from a confusion matrix"""
+    cm = np.asarray(cm, dtype=np.float64)
+    tp = np.diag(cm)
+    support, predicted, total = cm.sum(axis=1), cm.sum(axis=0), cm.sum()
+    # A class that is never predicted (or never present) scores 0 rather than NaN
+    precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+    recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros_like(tp), where=precision + recall > 0)
+    weights = support / total if total else np.zeros_like(support)
+
+    def summary(p, r, f, n):
+        return {"precision": round(float(p), 4), "recall": round(float(r), 4), "f1": round(float(f), 4), "support": int(n)}
+    return {
+        "accuracy": round(float(tp.sum() / total), 4) if total else 0.0,
+        "per_class": {label: summary(precision[i], recall[i], f1[i], support[i]) for i, label in enumerate(labels)},
+        "macro_avg": summary(precision.mean(), recall.mean(), f1.mean(), total),
+        "weighted_avg": summary(precision @ weights, recall @ weights, f1 @ weights, total),
+    }
+
+def score_rows(rows):
+    """Confusion matrix and scores over the rows that were classified"""
+    scored = [r for r in rows if r.get("predicted") in LABELS]
+    cm = confusion_matrix([LABELS.index(r["actual"]) for r in scored], [LABELS.index(r["predicted"]) for r in scored])
+    return dict({"labels": LABELS, "confusion_matrix": cm.tolist()}, **scores(cm))
+
+def score_predictions(path):
+    """Scores for the predictions already saved in a CSV's "Predicted Label" column"""
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = [{"actual": r.get("Actual Label", "").strip(), "predicted": r.get("Predicted Label", "").strip()}
+                for r in csv.DictReader(f)]
+    return score_rows([r for r in rows if r["actual"] in LABELS])
+
+def format_report(results):
+    """Text report in the spirit of sklearn's classification_report"""
+    lines = [f"{'':>14}{'precision':>11}{'recall':>9}{'f1':>8}{'support':>9}"]
+    rows = [(label, s) for label, s in results["per_class"].items()]
+    rows += [("macro avg", results["macro_avg"]), ("weighted avg", results["weighted_avg"])]
+    for name, s in rows:
+        lines.append(f"{name:>14}{s['precision']:>11.4f}{s['recall']:>9.4f}{s['f1']:>8.4f}{s['support']:>9}")
+    lines.append(f"{'accuracy':>14}{results['accuracy']:>36.4f}")
+    return "\n".join(lines)
+
+def evaluate(input_path, fixtures=None, cache_path=None, fetch=False, lang="en", keywords=None,
+             keyword_threshold=None, profanity_threshold=None, workers=None, features_path=None):
+    """Re-classify every labeled video in input_path; returns the results dict.
+
+    With features_path the features of every scored video are saved for features.py.
+    """
+    import app
+    items = list(iter_labeled(input_path))
+    start = time.perf_counter()
+    scorer_args = (lang, keywords, keyword_threshold, profanity_threshold, bool(features_path))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=((fixtures, cache_path, fetch), scorer_args)) as pool:
+        chunksize = max(1, len(items) // ((workers or os.cpu_count() or 1) * 8))
+        rows = list(pool.map(evaluate_in_worker, items, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    if features_path:
+        from features import FeatureWriter
+        feature_writer = FeatureWriter(features_path, keywords or app.restricted_keywords)
+        for r in rows:
+            if "features" in r:
+                feature_writer.add(r.pop("features"))
+        feature_writer.close()
+    status = {}
+    for r in rows:
+        status[r["status"]] = status.get(r["status"], 0) + 1
+    if status.get("ok", 0) < len(rows):
+        logger.warning(f"{len(rows) - status.get('ok', 0)} of {len(rows)} videos could not be scored: {status}")
+    results = {
+        "input": input_path,
+        "source": {"fixtures": fixtures} if fixtures else {"cache": cache_path or "default", "fetch": fetch},
+        "config": {
+            "lang": lang,
+            "keywords": keywords or app.restricted_keywords,
+            "keyword_threshold": app.KEYWORD_THRESHOLD if keyword_threshold is None else keyword_threshold,
+            "profanity_threshold": app.PROFANITY_THRESHOLD if profanity_threshold is None else profanity_threshold,
+        },
+        "videos": len(rows),
+        "status": status,
+        "seconds": round(elapsed, 3),
+    }
+    results.update(score_rows(rows))
+    results["mismatches"] = [r["url"] for r in rows if r["predicted"] and r["predicted"] != r["actual"]]
+    results["predictions"] = rows
+    return results
+
+def write_predictions(path, rows):
+    """Predictions in the layout of youtube_video_classification.csv"""
+    with open(path, "w", newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Video URL", "Actual Label", "Predicted Label"])
+        for r in rows:
+            writer.writerow([r["url"], r["actual"], r["predicted"]])
+
+def main():
+    parser = argparse.ArgumentParser(description="Score the classifier against labeled videos without calling the API")
+    parser.add_argument("input", nargs="?", default="youtube_video_classification.csv",
+                        help="CSV with 'Video URL' and 'Actual Label' columns")
+    parser.add_argument("-o", "--output", default="evaluation.json", help="results file (JSON)")
+    parser.add_argument("--predictions", help="also write the predictions as CSV (Video URL, Actual/Predicted Label)")
+    parser.add_argument("--fixtures", help="read stats and transcripts from this fixture directory (standin.py layout)")
+    parser.add_argument("--cache-path", help="read from this fetch cache (default: ~/.cache/youtube_analyzer/cache.sqlite3)")
+    parser.add_argument("--fetch", action="store_true", help="fetch videos missing from the cache (uses API quota)")
+    parser.add_argument("--lang", default="en", help="transcript language")
+    parser.add_argument("--keywords", help="file of keyword patterns (one regex per line) to use instead of the built-in list")
+    parser.add_argument("--keyword-threshold", type=int, help="distinct keyword matches that make a transcript restricted")
+    parser.add_argument("--profanity-threshold", type=int, help="a transcript with more profane words than this is restricted")
+    parser.add_argument("--features", help="also save per-video features (.npz) for re-scoring with features.py")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="scoring processes (default: CPU count)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s:%(name)s:%(message)s")
+    results = evaluate(args.input, args.fixtures, args.cache_path, args.fetch, args.lang,
+                       read_keywords(args.keywords) if args.keywords else None,
+                       args.keyword_threshold, args.profanity_threshold, args.workers, args.features)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    if args.predictions:
+        write_predictions(args.predictions, results["predictions"])
+    print(f"Scored {results['status'].get('ok', 0)} of {results['videos']} videos in {results['seconds']}s")
+    print(f"Confusion matrix (rows actual, columns predicted; {' / '.join(LABELS)}): {results['confusion_matrix']}")
+    print(format_report(results))
+    print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
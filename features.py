@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Columnar per-video features, and a vectorized re-scorer for trying new rules on them.
+
+batch.py --features and evaluate.py --features save what every decision was made
+from, one row per video, as NumPy columns in an .npz file:
+
+    video_id, actual, predicted      label codes: -1 unknown, 0 Safe, 1 Restricted
+    keyword_counts                   hits per restricted-keyword pattern (rows x patterns)
+    profanity                        profane word count of the transcript
+    has_transcript, age_restricted   transcript found; YouTube's own age flag
+    blocklist                        channel / video / playlist blocklist hits (rows x 3)
+    has_comments, sentiment_hist     comment compound scores binned in steps of 0.05 (rows x 40)
+
+Rescoring applies thresholds and rules to whole columns at once, so millions of
+rows take seconds, and reports how many decisions changed. Thresholds, dropped
+patterns and sentiment cutoffs (on the 0.05 grid) need no refetching; a brand-new
+keyword pattern needs the text, so re-run evaluate.py from the cache instead.
+--drop-keyword takes a pattern's words without \\b or lookaheads (gambling,
+"sex|sexual") or its index; an unknown name prints the full list.
+
+    python features.py features.npz --profanity-threshold 5 --drop-keyword gambling --changed flips.csv
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VERSION = 1
+LABELS = ["Safe", "Restricted"]
+BLOCKLISTS = ["channel", "video", "playlist"]
+SENTIMENT_LABELS = ["Positive", "Negative", "Neutral"]
+# Compound scores in [-1, 1] fall into 40 bins of 0.05 (VADER rounds them to 4 decimals)
+SENTIMENT_STEP = 500  # in 1e-4 units
+SENTIMENT_BINS = 40
+ROW_COLUMNS = ["video_id", "actual", "predicted", "keyword_counts", "profanity", "has_transcript", "age_restricted",
+               "blocklist", "has_comments", "sentiment_hist"]
+
+def label_code(label):
+    return LABELS.index(label) if label in LABELS else -1
+
+def sentiment_histogram(scores):
+    """Bin counts of compound scores: [a, b) bins from 0 up and (a, b] bins below 0, so
+    counting ">= t" and "<= -t" from the bins is exact for any t on the 0.05 grid"""
+    q = np.rint(np.asarray(scores, dtype=np.float64) * 10000).astype(np.int64)
+    idx = np.where(q >= 0, SENTIMENT_BINS // 2 + q // SENTIMENT_STEP, SENTIMENT_BINS // 2 - 1 - (-q) // SENTIMENT_STEP)
+    return np.bincount(np.clip(idx, 0, SENTIMENT_BINS - 1), minlength=SENTIMENT_BINS)
+
+def threshold_bin(threshold):
+    """Histogram bin where a threshold on the 0.05 grid falls; ValueError off the grid"""
+    q = round(threshold * 10000)
+    if q % SENTIMENT_STEP or abs(threshold * 10000 - q) > 1e-6:
+        raise ValueError(f"sentiment threshold {threshold} is not a multiple of {SENTIMENT_STEP / 10000}")
+    return SENTIMENT_BINS // 2 + q // SENTIMENT_STEP
+
+def video_features(vid, actual, predicted, stats, sources, keyword_counts=None, profanity=0, comment_scores=None):
+    """One feature row; keyword_counts is None without a transcript, comment_scores None without comments"""
+    return {
+        "video_id": vid,
+        "actual": label_code(actual),
+        "predicted": label_code(predicted),
+        "keyword_counts": keyword_counts,
+        "profanity": profanity,
+        "has_transcript": keyword_counts is not None,
+        "age_restricted": bool(stats.get("age_restricted_by_youtube", False)),
+        "blocklist": [name in sources for name in BLOCKLISTS],
+        "has_comments": comment_scores is not None,
+        "sentiment_hist": sentiment_histogram(comment_scores if comment_scores is not None else ()),
+    }
+
+class FeatureWriter:
+    """Collects feature rows in fixed-size column chunks and writes them as one .npz on close.
+
+    With append=True the columns of an existing file (same keyword patterns) are kept,
+    and a video seen again replaces its old row.
+    """
+    def __init__(self, path, patterns, append=False, chunk_rows=4096):
+        self.path = path
+        self.patterns = list(patterns)
+        self.chunk_rows = chunk_rows
+        self.chunks = []
+        self.ids = []
+        self.buffer = None
+        self.old = None
+        if append and os.path.exists(path):
+            old = load_features(path)
+            if list(old["patterns"]) == self.patterns:
+                self.old = {name: old[name] for name in ROW_COLUMNS}
+            else:
+                logger.warning(f"Keyword patterns changed since {path} was written; starting it afresh")
+
+    def allocate(self, n):
+        """Empty columns for n rows, video_id excepted"""
+        return {
+            "actual": np.empty(n, dtype=np.int8),
+            "predicted": np.empty(n, dtype=np.int8),
+            "keyword_counts": np.empty((n, len(self.patterns)), dtype=np.int32),
+            "profanity": np.empty(n, dtype=np.int32),
+            "has_transcript": np.empty(n, dtype=bool),
+            "age_restricted": np.empty(n, dtype=bool),
+            "blocklist": np.empty((n, len(BLOCKLISTS)), dtype=bool),
+            "has_comments": np.empty(n, dtype=bool),
+            "sentiment_hist": np.empty((n, SENTIMENT_BINS), dtype=np.int32),
+        }
+
+    def add(self, row):
+        if self.buffer is None:
+            self.buffer = self.allocate(self.chunk_rows)
+        i = len(self.ids)
+        self.ids.append(row["video_id"])
+        for name, column in self.buffer.items():
+            value = row[name]
+            column[i] = 0 if value is None else value  # keyword_counts is None without a transcript
+        if len(self.ids) == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Move the filled part of the current chunk to the finished chunks"""
+        n = len(self.ids)
+        if n:
+            chunk = {name: column[:n] for name, column in self.buffer.items()}
+            chunk["video_id"] = np.array(self.ids, dtype="S")
+            self.chunks.append(chunk)
+        self.ids, self.buffer = [], None
+
+    def close(self):
+        self.flush()
+        empty = dict(self.allocate(0), video_id=np.zeros(0, dtype="S11"))
+        parts = [empty] + self.chunks
+        new = {name: np.concatenate([part[name] for part in parts]) for name in ROW_COLUMNS}
+        self.chunks = []
+        # A video added more than once keeps its last row
+        ids = new["video_id"]
+        _, last = np.unique(ids[::-1], return_index=True)
+        if len(last) < len(ids):
+            keep = np.sort(len(ids) - 1 - last)
+            new = {name: column[keep] for name, column in new.items()}
+        columns = new
+        if self.old is not None:
+            kept = ~np.isin(self.old["video_id"], new["video_id"])
+            columns = {name: np.concatenate([self.old[name][kept], new[name]]) for name in ROW_COLUMNS}
+        n = len(columns["video_id"])
+        meta = {"version": VERSION, "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "rows": n}
+        tmp = f"{self.path}.tmp.npz"
+        np.savez_compressed(tmp, patterns=np.array(self.patterns, dtype=str), meta=np.array(json.dumps(meta)), **columns)
+        os.replace(tmp, self.path)
+        logger.info(f"Wrote features for {n} videos to {self.path}")
+
+def load_features(path):
+    """All columns of a feature file as a dict of arrays"""
+    with np.load(path) as data:
+        features = {name: data[name] for name in data.files}
+    meta = json.loads(str(features["meta"]))
+    if meta.get("version") != VERSION:
+        raise ValueError(f"{path} has feature version {meta.get('version')}, expected {VERSION}")
+    return features
+
+def keyword_labels(patterns):
+    """Display labels for patterns, as RestrictedContentMatcher makes them"""
+    return [p.strip(r'\b()') for p in patterns]
+
+def keyword_keys(patterns):
+    """Command-line keys for patterns: the words without \\b, groups or lookaheads (e.g. "sex|sexual")"""
+    return [re.sub(r"\(\?[!=<].*?\)|\\b|[()]", "", str(p)) for p in patterns]
+
+def keyword_indices(patterns, names):
+    """Pattern indices for names given as a key, a result label or a pattern index"""
+    keys, labels = keyword_keys(patterns), keyword_labels(patterns)
+    indices, unknown = set(), []
+    for name in names:
+        if name.isdigit() and int(name) < len(keys):
+            indices.add(int(name))
+        elif name in keys or name in labels:
+            indices.add(keys.index(name) if name in keys else labels.index(name))
+        else:
+            unknown.append(name)
+    if unknown:
+        valid = ", ".join(f"{i}={key}" for i, key in enumerate(keys))
+        raise ValueError(f"Unknown keywords: {', '.join(unknown)} (use a key or index: {valid})")
+    return indices
+
+class Rules:
+    """A restriction and sentiment rule set that can be applied to feature columns.
+
+    A video is restricted when YouTube age-restricts it, it is on a blocklist, at
+    least keyword_threshold patterns have min_hits hits each, or it has more than
+    profanity_threshold profane words. Defaults match app.py and sentiment.py.
+    """
+    def __init__(self, keyword_threshold=1, profanity_threshold=3, min_hits=1, drop_keywords=(),
+                 ignore_sources=(), positive_threshold=0.05, negative_threshold=-0.05):
+        self.keyword_threshold = keyword_threshold
+        self.profanity_threshold = profanity_threshold
+        self.min_hits = min_hits
+        self.drop_keywords = set(drop_keywords)
+        self.ignore_sources = set(ignore_sources)
+        self.positive_bin = threshold_bin(positive_threshold)
+        self.negative_bin = threshold_bin(negative_threshold)
+        self.config = {"keyword_threshold": keyword_threshold, "profanity_threshold": profanity_threshold,
+                       "min_hits": min_hits, "drop_keywords": sorted(self.drop_keywords),
+                       "ignore_sources": sorted(self.ignore_sources),
+                       "positive_threshold": positive_threshold, "negative_threshold": negative_threshold}
+
+    def restricted(self, f):
+        """Boolean column: the decision for every row"""
+        keep = np.ones(len(f["patterns"]), dtype=bool)
+        keep[list(keyword_indices(f["patterns"], self.drop_keywords))] = False
+        matched = (f["keyword_counts"][:, keep] >= self.min_hits).sum(axis=1)
+        transcript = f["has_transcript"] & ((matched >= self.keyword_threshold) | (f["profanity"] > self.profanity_threshold))
+        result = transcript.copy()
+        if "youtube" not in self.ignore_sources:
+            result |= f["age_restricted"]
+        for i, name in enumerate(BLOCKLISTS):
+            if name not in self.ignore_sources:
+                result |= f["blocklist"][:, i]
+        return result
+
+    def sentiment_counts(self, f):
+        """(rows x 3) Positive / Negative / Neutral comment counts"""
+        hist = f["sentiment_hist"]
+        pos = hist[:, self.positive_bin:].sum(axis=1)
+        neg = hist[:, :self.negative_bin].sum(axis=1)
+        return np.stack([pos, neg, hist.sum(axis=1) - pos - neg], axis=1)
+
+def dominant_sentiment(counts, has_comments):
+    """Index into SENTIMENT_LABELS of each row's largest count (first on ties), -1 without comments"""
+    return np.where(has_comments, counts.argmax(axis=1), -1)
+
+def rescore(features, rules, baseline=None):
+    """Apply rules to every row and compare with the saved decisions (or with a baseline rule set).
+
+    Returns the report dict and the indices of the rows whose restriction decision changed.
+    """
+    from evaluate import confusion_matrix, scores
+    start = time.perf_counter()
+    new = rules.restricted(features)
+    old = baseline.restricted(features) if baseline else features["predicted"] == 1
+    valid = features["predicted"] >= 0 if baseline is None else np.ones(len(new), dtype=bool)
+    changed = np.flatnonzero(valid & (new != old))
+    base_rules = baseline or Rules()
+    new_counts, old_counts = rules.sentiment_counts(features), base_rules.sentiment_counts(features)
+    has_comments = features["has_comments"]
+    sentiment_changed = int(np.count_nonzero(dominant_sentiment(new_counts, has_comments)
+                                             != dominant_sentiment(old_counts, has_comments)))
+    report = {
+        "rows": int(len(new)),
+        "rules": rules.config,
+        "restricted": {"before": int(np.count_nonzero(old & valid)), "after": int(np.count_nonzero(new & valid))},
+        "changed": int(len(changed)),
+        "safe_to_restricted": int(np.count_nonzero(new[changed])),
+        "restricted_to_safe": int(np.count_nonzero(~new[changed])),
+        "sentiment": {"before": dict(zip(SENTIMENT_LABELS, old_counts.sum(axis=0).tolist())),
+                      "after": dict(zip(SENTIMENT_LABELS, new_counts.sum(axis=0).tolist())),
+                      "dominant_changed": sentiment_changed},
+    }
+    labeled = features["actual"] >= 0
+    if labeled.any():
+        for name, decided in (("before", old), ("after", new)):
+            cm = confusion_matrix(features["actual"][labeled], decided[labeled].astype(np.int64))
+            report.setdefault("scores", {})[name] = dict({"confusion_matrix": cm.tolist()}, **scores(cm))
+    report["seconds"] = round(time.perf_counter() - start, 3)
+    return report, changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score saved video features with new thresholds or rules")
+    parser.add_argument("features", help=".npz written by batch.py --features or evaluate.py --features")
+    parser.add_argument("--keyword-threshold", type=int, default=1, help="distinct keyword patterns needed")
+    parser.add_argument("--profanity-threshold", type=int, default=3, help="restricted above this many profane words")
+    parser.add_argument("--min-hits", type=int, default=1, help="hits a pattern needs to count as matched")
+    parser.add_argument("--drop-keyword", action="append", default=[], metavar="KEY",
+                        help="ignore this keyword pattern, by key (e.g. gambling, \"sex|sexual\") or index (repeatable)")
+    parser.add_argument("--ignore-source", action="append", default=[], choices=BLOCKLISTS + ["youtube"],
+                        help="ignore a blocklist or YouTube's age flag (repeatable)")
+    parser.add_argument("--positive-threshold", type=float, default=0.05, help="compound score for Positive (0.05 steps)")
+    parser.add_argument("--negative-threshold", type=float, default=-0.05, help="compound score for Negative (0.05 steps)")
+    parser.add_argument("--changed", help="write the videos whose decision changed as CSV")
+    parser.add_argument("-o", "--output", help="write the report as JSON")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:%(message)s")
+    features = load_features(args.features)
+    try:
+        rules = Rules(args.keyword_threshold, args.profanity_threshold, args.min_hits, args.drop_keyword,
+                      args.ignore_source, args.positive_threshold, args.negative_threshold)
+        report, changed = rescore(features, rules)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.changed:
+        with open(args.changed, "w", newline='', encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["video_id", "before", "after"])
+            for i in changed:
+                writer.writerow([features["video_id"][i].decode(), LABELS[int(features["predicted"][i])],
+                                 LABELS[1 - int(features["predicted"][i])]])
+
+if __name__ == "__main__":
+    main()
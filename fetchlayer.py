@@ -0,0 +1,171 @@
+"""Shared layer for remote calls: retries with backoff, quota handling, concurrency limits and deadlines.
+
+Every Data API request and transcript download goes through FetchLayer.call.
+Failures are classified before deciding what to do:
+
+- transient (5xx, network errors, timeouts) and rate (429, rateLimitExceeded):
+  retried with exponential backoff and full jitter, honouring Retry-After,
+  until the attempt limit or the call's deadline;
+- quota (quotaExceeded, dailyLimitExceeded): not retried, and further Data API
+  calls fail fast until the cooldown passes instead of hammering the API;
+- not_found (deleted video, disabled comments or transcripts): not retried;
+  callers treat it as a genuine empty result;
+- error (anything else, e.g. 400 or 403 forbidden): not retried.
+
+A call that still fails raises FetchError, so a failed fetch is never mistaken
+for an empty one. Each call's outcome is counted in metrics as api_outcomes
+{method, outcome} and every retry as retries {method, reason}.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Concurrent requests allowed per endpoint
+DEFAULT_LIMITS = {
+    "videos.list": 8,
+    "commentThreads.list": 8,
+    "playlistItems.list": 4,
+    "channels.list": 2,
+    "transcript": 4,
+}
+TRANSIENT_STATUS = {500, 502, 503, 504}
+QUOTA_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+RATE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+NOT_FOUND_REASONS = {"videoNotFound", "playlistNotFound", "channelNotFound", "commentsDisabled", "transcriptNotFound"}
+# youtube_transcript_api exceptions that mean there is no transcript to fetch
+TRANSCRIPT_MISSING = {"TranscriptsDisabled", "NoTranscriptFound", "NoTranscriptAvailable", "VideoUnavailable",
+                      "InvalidVideoId", "AgeRestricted", "VideoUnplayable"}
+TRANSCRIPT_TRANSIENT = {"RequestBlocked", "IpBlocked", "YouTubeRequestFailed", "TooManyRequests"}
+
+class FetchError(Exception):
+    """A remote call failed for good; kind is transient, rate, quota, not_found, deadline or error"""
+    def __init__(self, method, kind, cause):
+        super().__init__(f"{method} failed ({kind}): {cause}")
+        self.method = method
+        self.kind = kind
+        self.cause = cause
+
+def error_details(exc):
+    """(HTTP status, API error reason, Retry-After seconds) from an HttpError or urllib HTTPError"""
+    resp = getattr(exc, "resp", None)
+    if resp is not None:  # googleapiclient.errors.HttpError
+        status, headers, body = resp.status, resp, getattr(exc, "content", b"")
+    elif hasattr(exc, "code") and hasattr(exc, "headers"):  # urllib.error.HTTPError
+        status, headers = exc.code, exc.headers
+        try:
+            body = exc.read()
+        except Exception:
+            body = b""
+    else:
+        return None, "", None
+    reason = ""
+    try:
+        reason = json.loads(body)["error"]["errors"][0]["reason"]
+    except Exception:
+        pass
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = None
+    return status, reason, retry_after
+
+def classify_error(exc):
+    """(kind, Retry-After seconds or None) for an exception raised by a remote call"""
+    name = type(exc).__name__
+    if name in TRANSCRIPT_MISSING:
+        return "not_found", None
+    if name in TRANSCRIPT_TRANSIENT:
+        return "transient", None
+    status, reason, retry_after = error_details(exc)
+    if status is not None:
+        if reason in QUOTA_REASONS:
+            return "quota", None
+        if status == 429 or reason in RATE_REASONS:
+            return "rate", retry_after
+        if status in TRANSIENT_STATUS:
+            return "transient", retry_after
+        if status == 404 or reason in NOT_FOUND_REASONS:
+            return "not_found", None
+        return "error", None
+    if isinstance(exc, (OSError, TimeoutError)) or type(exc).__module__.startswith("httplib2"):
+        return "transient", None
+    return "error", None
+
+class FetchLayer:
+    """Runs remote calls with per-endpoint concurrency limits, retries and an overall deadline per call"""
+    def __init__(self, max_attempts=5, base_delay=0.5, max_delay=30.0, deadline=60.0, limits=None,
+                 quota_cooldown=3600.0, sleep=time.sleep, clock=time.monotonic):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.quota_cooldown = quota_cooldown
+        self.sleep = sleep
+        self.clock = clock
+        self.quota_blocked_until = 0.0
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def semaphore(self, method):
+        with self._lock:
+            sem = self._semaphores.get(method)
+            if sem is None:
+                sem = self._semaphores[method] = threading.BoundedSemaphore(self.limits.get(method, 4))
+            return sem
+
+    def backoff(self, attempt, kind, retry_after):
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # Rate limiting clears more slowly than a flaky backend, so start from a longer delay
+        base = self.base_delay * (4 if kind == "rate" else 1)
+        return random.uniform(0, min(self.max_delay, base * 2 ** (attempt - 1)))
+
+    def outcome(self, method, outcome, attempt):
+        metrics.incr("api_outcomes", method=method, outcome=outcome)
+        logger.debug(f"{method}: {outcome} after {attempt} attempt(s)")
+
+    def call(self, method, fn, deadline=None, before=None):
+        """Return fn() for the given endpoint, retrying transient failures; raises FetchError.
+
+        before, if given, runs ahead of every attempt outside the endpoint's concurrency
+        limit (e.g. waiting for quota tokens); the time it takes extends the deadline.
+        """
+        if method != "transcript" and self.clock() < self.quota_blocked_until:
+            self.outcome(method, "quota", 0)
+            raise FetchError(method, "quota", "daily quota exhausted; not calling the API until the cooldown passes")
+        deadline = self.clock() + (deadline or self.deadline)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if before is not None:
+                    waited_from = self.clock()
+                    before()
+                    deadline += self.clock() - waited_from
+                with self.semaphore(method):
+                    result = fn()
+            except Exception as e:
+                kind, retry_after = classify_error(e)
+                if kind == "quota":
+                    self.quota_blocked_until = self.clock() + self.quota_cooldown
+                    logger.error(f"API quota exhausted; pausing Data API calls for {self.quota_cooldown:.0f}s")
+                if kind in ("transient", "rate") and attempt < self.max_attempts:
+                    delay = self.backoff(attempt, kind, retry_after)
+                    if self.clock() + delay < deadline:
+                        metrics.incr("retries", method=method, reason=kind)
+                        logger.warning(f"{method} attempt {attempt} failed ({kind}: {e}); retrying in {delay:.1f}s")
+                        self.sleep(delay)
+                        continue
+                    kind = "deadline"
+                self.outcome(method, kind, attempt)
+                raise FetchError(method, kind, e) from e
+            self.outcome(method, "ok" if attempt == 1 else "retried", attempt)
+            return result
+
+fetch_layer = FetchLayer()
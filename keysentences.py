@@ -0,0 +1,145 @@
+"""Key-sentence extraction for long transcripts: LexRank over sparse TF-IDF vectors.
+
+Sentences become L2-normalised TF-IDF rows of a SciPy CSR matrix, so cosine
+similarity is one sparse product and only pairs that share a term are stored.
+Long transcripts are ranked in windows of sentences; the best sentences of
+each window are then ranked against each other. A window is halved while its
+estimated number of similarity entries exceeds the memory budget, and once
+the time budget runs out the remaining windows fall back to a linear-time
+centroid score.
+"""
+import logging
+import re
+import time
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+WORD = re.compile(r"[a-z0-9][a-z0-9']*")
+
+_stop_words = None
+
+def get_stop_words():
+    global _stop_words
+    if _stop_words is None:
+        from sumy.utils import get_stop_words as sumy_stop_words
+        _stop_words = frozenset(sumy_stop_words("english"))
+    return _stop_words
+
+def split_sentences(txt, max_words=40):
+    """Split on sentence punctuation; unpunctuated runs (auto captions) are cut every max_words words"""
+    sentences = []
+    for part in SENTENCE_END.split(txt):
+        words = part.split()
+        for i in range(0, len(words), max_words):
+            sentences.append(" ".join(words[i:i + max_words]))
+    return sentences
+
+def tfidf_matrix(sentences):
+    """Rows are L2-normalised TF-IDF vectors (term frequency scaled by the row's max, as in LexRank)"""
+    stop = get_stop_words()
+    vocab = {}
+    indptr, indices = [0], []
+    for s in sentences:
+        for w in WORD.findall(s.lower()):
+            if w not in stop:
+                indices.append(vocab.setdefault(w, len(vocab)))
+        indptr.append(len(indices))
+    indices = np.asarray(indices, dtype=np.int32)
+    counts = sparse.csr_matrix((np.ones(len(indices), dtype=np.float64), indices, np.asarray(indptr)),
+                               shape=(len(sentences), max(len(vocab), 1)))
+    counts.sum_duplicates()
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log(len(sentences) / np.maximum(df, 1))
+    row_max = np.maximum(counts.max(axis=1).toarray().ravel(), 1)
+    tf = sparse.diags(1 / row_max) @ counts
+    x = (tf @ sparse.diags(idf)).tocsr()
+    norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags(1 / norms) @ x).tocsr()
+
+def similarity_entries(x):
+    """Upper bound on the stored entries of x @ x.T: sum over terms of (sentences containing it)^2"""
+    df = np.bincount(x.indices, minlength=x.shape[1]).astype(np.int64)
+    return int((df * df).sum())
+
+class KeySentenceEngine:
+    """Ranks sentences by LexRank centrality within a time and memory budget.
+
+    threshold drops weak similarities (sumy's default of 0.1); max_entries caps
+    the similarity matrix held for one window; time_budget is in seconds.
+    """
+    def __init__(self, window=1000, min_window=100, threshold=0.1, damping=0.85, tolerance=1e-6,
+                 max_iter=100, time_budget=3.0, max_entries=5_000_000):
+        self.window = window
+        self.min_window = min_window
+        self.threshold = threshold
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iter = max_iter
+        self.time_budget = time_budget
+        self.max_entries = max_entries
+
+    def rank(self, x):
+        """LexRank score of every row of x (power iteration on the thresholded similarity graph)"""
+        n = x.shape[0]
+        sim = (x @ x.T).tocsr()
+        sim.data[sim.data < self.threshold] = 0
+        sim.eliminate_zeros()
+        degree = np.asarray(sim.sum(axis=1)).ravel()
+        degree[degree == 0] = 1
+        transition = (sparse.diags(1 / degree) @ sim).T.tocsr()
+        scores = np.full(n, 1 / n)
+        for _ in range(self.max_iter):
+            updated = (1 - self.damping) / n + self.damping * (transition @ scores)
+            done = np.abs(updated - scores).sum() < self.tolerance
+            scores = updated
+            if done:
+                break
+        return scores
+
+    def centroid_scores(self, x):
+        """Cosine similarity of each row to the mean row; linear in the number of non-zeros"""
+        centroid = np.asarray(x.mean(axis=0)).ravel()
+        norm = np.linalg.norm(centroid)
+        return x @ (centroid / norm) if norm else np.zeros(x.shape[0])
+
+    def windows(self, x):
+        """(start, end) sentence ranges, halved where the similarity matrix would exceed the budget"""
+        start, n = 0, x.shape[0]
+        while start < n:
+            size = self.window
+            while size > self.min_window and similarity_entries(x[start:start + size]) > self.max_entries:
+                size //= 2
+            yield start, min(start + size, n)
+            start += size
+
+    def top_indices(self, x, count, deadline):
+        n = x.shape[0]
+        if n <= self.window and similarity_entries(x) <= self.max_entries:
+            return np.argsort(-self.rank(x), kind="stable")[:count]
+        candidates, over_budget = [], False
+        for start, end in self.windows(x):
+            part = x[start:end]
+            over_budget = over_budget or time.perf_counter() >= deadline
+            scores = self.centroid_scores(part) if over_budget else self.rank(part)
+            candidates.extend(start + np.argsort(-scores, kind="stable")[:count])
+        candidates = np.sort(np.asarray(candidates))
+        over_budget = over_budget or time.perf_counter() >= deadline
+        if over_budget:
+            logger.warning(f"Key-sentence time budget of {self.time_budget}s exceeded; fell back to centroid scores")
+        scores = self.centroid_scores(x[candidates]) if over_budget else self.rank(x[candidates])
+        return candidates[np.argsort(-scores, kind="stable")[:count]]
+
+    def extract(self, txt, count=10):
+        """The count most central sentences of txt, in document order"""
+        sentences = split_sentences(txt)
+        if not sentences:
+            return []
+        deadline = time.perf_counter() + self.time_budget
+        x = tfidf_matrix(sentences)
+        return [sentences[i] for i in sorted(self.top_indices(x, count, deadline))]
+
+key_sentence_engine = KeySentenceEngine()
@@ -0,0 +1,213 @@
+"""Pipeline instrumentation: per-stage timing spans, counters and report export.
+
+Stages record spans with `with metrics.span("stage"):` (or the @metrics.timed
+decorator); API calls, quota units, retries and cache hits are counters with
+labels. The collected data exports as a JSON report or in the Prometheus text
+format. Any stage can be run under cProfile by naming it in YTA_PROFILE
+(comma-separated, or "*" for all); profiles are written to YTA_PROFILE_DIR.
+"""
+import cProfile
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Quota units charged per Data API method
+QUOTA_COSTS = {
+    "videos.list": 1,
+    "commentThreads.list": 1,
+    "playlistItems.list": 1,
+    "channels.list": 1,
+    "search.list": 100,
+}
+
+PROMETHEUS_PREFIX = "yta"
+QUANTILES = (0.5, 0.9, 0.99)
+
+class StageStats:
+    """Count, total and max of a stage's durations, plus recent samples for quantiles"""
+    def __init__(self, max_samples):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def quantile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+class Metrics:
+    """Thread-safe collector shared by the GUI, the batch runner and the fetch layer"""
+    def __init__(self, profile_stages=None, profile_dir="profiles", max_samples=10000):
+        self.profile_stages = set(profile_stages or ())
+        self.profile_dir = profile_dir
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._profiled = 0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.counters = defaultdict(float)  # (name, sorted label items) -> value
+
+    def record(self, stage, seconds):
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats(self.max_samples)
+            stats.add(seconds)
+
+    def incr(self, name, value=1, **labels):
+        with self._lock:
+            self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    def api_call(self, method):
+        """Count one Data API request and the quota units it costs"""
+        self.incr("api_calls", method=method)
+        self.incr("quota_units", QUOTA_COSTS.get(method, 1), method=method)
+
+    def should_profile(self, stage):
+        return "*" in self.profile_stages or stage in self.profile_stages
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as one run of stage (and profile it if requested)"""
+        profiler = self._start_profile() if self.should_profile(stage) else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+            if profiler:
+                self._finish_profile(profiler, stage)
+
+    def timed(self, stage):
+        """Decorator form of span"""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def _start_profile(self):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return None  # another profiler is already active on this thread (nested span)
+        return profiler
+
+    def _finish_profile(self, profiler, stage):
+        profiler.disable()
+        with self._lock:
+            self._profiled += 1
+            n = self._profiled
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{stage}-{os.getpid()}-{n}.prof")
+        profiler.dump_stats(path)
+        logger.info(f"Wrote cProfile stats for stage '{stage}' to {path}")
+
+    def snapshot(self):
+        """Raw, picklable copy of everything recorded, for merging across processes"""
+        with self._lock:
+            return {
+                "stages": {k: (s.count, s.total, s.max, list(s.samples)) for k, s in self.stages.items()},
+                "counters": [(name, labels, value) for (name, labels), value in self.counters.items()],
+            }
+
+    def drain(self):
+        """Snapshot and reset in one step"""
+        snap = self.snapshot()
+        self.reset()
+        return snap
+
+    def merge(self, snap):
+        with self._lock:
+            for stage, (count, total, longest, samples) in snap["stages"].items():
+                stats = self.stages.get(stage)
+                if stats is None:
+                    stats = self.stages[stage] = StageStats(self.max_samples)
+                stats.count += count
+                stats.total += total
+                stats.max = max(stats.max, longest)
+                stats.samples.extend(samples)
+            for name, labels, value in snap["counters"]:
+                self.counters[(name, tuple(labels))] += value
+
+    def report(self):
+        """Summary as a JSON-serializable dict"""
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": s.count,
+                    "total_s": round(s.total, 6),
+                    "mean_ms": round(s.total / s.count * 1000, 3),
+                    "p50_ms": round(s.quantile(0.5) * 1000, 3),
+                    "p99_ms": round(s.quantile(0.99) * 1000, 3),
+                    "max_ms": round(s.max * 1000, 3),
+                }
+                for stage, s in sorted(self.stages.items())
+            }
+            counters = defaultdict(dict)
+            for (name, labels), value in sorted(self.counters.items()):
+                key = ",".join(f"{k}={v}" for k, v in labels) or "total"
+                counters[name][key] = int(value) if value == int(value) else value
+        return {"stages": stages, "counters": dict(counters)}
+
+    def to_json(self):
+        return json.dumps(self.report(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format: a summary for stage timings and one counter per name"""
+        lines = []
+        with self._lock:
+            name = f"{PROMETHEUS_PREFIX}_stage_duration_seconds"
+            lines += [f"# HELP {name} Time spent in each pipeline stage", f"# TYPE {name} summary"]
+            for stage, s in sorted(self.stages.items()):
+                label = f'stage="{escape_label(stage)}"'
+                for q in QUANTILES:
+                    lines.append(f'{name}{{{label},quantile="{q}"}} {s.quantile(q):.6f}')
+                lines.append(f"{name}_sum{{{label}}} {s.total:.6f}")
+                lines.append(f"{name}_count{{{label}}} {s.count}")
+            by_name = defaultdict(list)
+            for (counter, labels), value in sorted(self.counters.items()):
+                by_name[counter].append((labels, value))
+            for counter, series in by_name.items():
+                name = f"{PROMETHEUS_PREFIX}_{counter}_total"
+                lines += [f"# TYPE {name} counter"]
+                for labels, value in series:
+                    label = ",".join(f'{k}="{escape_label(v)}"' for k, v in labels)
+                    lines.append(f"{name}{{{label}}} {value:g}" if label else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path=None, prometheus_path=None):
+        for path, render in ((json_path, self.to_json), (prometheus_path, self.to_prometheus)):
+            if path:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(render())
+                logger.info(f"Wrote metrics to {path}")
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def stages_from_env():
+    return [s.strip() for s in os.getenv("YTA_PROFILE", "").split(",") if s.strip()]
+
+metrics = Metrics(stages_from_env(), os.getenv("YTA_PROFILE_DIR", "profiles"))
@@ -0,0 +1,47 @@
+"""Token-bucket limiter that paces YouTube Data API calls to a daily quota.
+
+Tokens are quota units. The bucket refills continuously at daily_units per day
+and holds at most `burst` units, so short bursts go through immediately while
+the long-run spend never exceeds the daily allowance.
+"""
+import threading
+import time
+
+# Default daily allowance of a Data API project
+DEFAULT_DAILY_QUOTA = 10000
+
+class QuotaLimiter:
+    """Thread-safe token bucket; acquire(units) blocks until the units are available"""
+    def __init__(self, daily_units=DEFAULT_DAILY_QUOTA, burst=None, clock=time.monotonic):
+        self.rate = daily_units / 86400
+        self.capacity = burst or max(daily_units / 100, 1)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, units=1, timeout=None):
+        """Take units from the bucket, waiting as needed; False if timeout (seconds) passes first"""
+        units = min(units, self.capacity)
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= units:
+                    self.tokens -= units
+                    return True
+                wait = (units - self.tokens) / self.rate
+                if deadline is not None:
+                    if self.clock() + wait > deadline:
+                        return False
+                self._cond.wait(wait)
+
+    def available(self):
+        with self._cond:
+            self._refill()
+            return self.tokens
@@ -0,0 +1,113 @@
+"""Batched sentiment scoring for comment sets and transcript sentences.
+
+The VADER lexicon is loaded once per process. Large inputs are split into chunks
+and scored across a process pool; the scores come back as one NumPy array, and
+the Positive/Negative/Neutral buckets are computed on that array.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
+
+# VADER's conventional compound-score cutoffs
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+_analyzer = None
+
+def get_analyzer():
+    """The process's SentimentIntensityAnalyzer, loading the lexicon on first use"""
+    global _analyzer
+    if _analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+def score_chunk(texts):
+    analyzer = get_analyzer()
+    return np.fromiter((analyzer.polarity_scores(t)['compound'] for t in texts), dtype=np.float64, count=len(texts))
+
+def polarity_chunk(sentences):
+    from textblob.en import sentiment as pattern_sentiment
+    # Same scorer as TextBlob(s).sentiment.polarity, without building a TextBlob per sentence
+    return np.fromiter((pattern_sentiment(s)[0] for s in sentences), dtype=np.float64, count=len(sentences))
+
+def bucket_counts(scores):
+    """Positive/Negative/Neutral counts for an array of compound scores"""
+    pos = int(np.count_nonzero(scores >= POSITIVE_THRESHOLD))
+    neg = int(np.count_nonzero(scores <= NEGATIVE_THRESHOLD))
+    return {"Positive": pos, "Negative": neg, "Neutral": len(scores) - pos - neg}
+
+def iter_chunks(items, size):
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+class SentimentEngine:
+    """Reusable comment scorer; inputs below parallel_threshold are scored in-process"""
+    def __init__(self, workers=None, chunk_size=2000, parallel_threshold=5000):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.parallel_threshold = parallel_threshold
+        self._pool = None
+
+    def pool(self):
+        if self._pool is None:
+            # Spawned, not forked: the pool is created from GUI worker threads, and forking a
+            # multithreaded Tk process can deadlock the child
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=get_analyzer,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def scores(self, comments):
+        """Compound score of every comment, in input order, as a float64 array"""
+        if not isinstance(comments, (list, tuple)):
+            comments = list(comments)
+        if self.workers == 1 or len(comments) < self.parallel_threshold:
+            return score_chunk(comments)
+        parts = list(self.pool().map(score_chunk, iter_chunks(comments, self.chunk_size)))
+        return np.concatenate(parts)
+
+    def counts(self, comments):
+        return bucket_counts(self.scores(comments))
+
+    def polarities(self, sentences):
+        """TextBlob polarity of every sentence, in input order, as a float64 array"""
+        if self.workers == 1 or len(sentences) < self.parallel_threshold:
+            return polarity_chunk(sentences)
+        parts = list(self.pool().map(polarity_chunk, iter_chunks(sentences, self.chunk_size)))
+        return np.concatenate(parts)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+sentiment_engine = SentimentEngine()
+
+SENTENCE_LABELS = ["Positive", "Negative", "Neutral"]
+
+def split_sentences(txt):
+    return [s for s in txt.split('.') if s.strip()]
+
+def transcript_sentiment(txt, engine=None):
+    """Sentence-level sentiment of a transcript as typed columns.
+
+    Returns a DataFrame with Sentence (object), Polarity (float32) and Sentiment
+    (categorical over SENTENCE_LABELS), built straight from the score array.
+    """
+    import pandas as pd
+    engine = engine or sentiment_engine
+    sentences = split_sentences(txt)
+    polarity = engine.polarities(sentences)
+    # Label from the exact scores before narrowing them for storage
+    codes = np.where(polarity > 0, 0, np.where(polarity < 0, 1, 2)).astype(np.int8)
+    return pd.DataFrame({
+        'Sentence': pd.Series(sentences, dtype=object),
+        'Polarity': polarity.astype(np.float32),
+        'Sentiment': pd.Categorical.from_codes(codes, categories=SENTENCE_LABELS),
+    })
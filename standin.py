@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""Local stand-in for the YouTube Data API and the transcript provider.
+
+Serves videos.list, commentThreads.list, playlistItems.list and channels.list under
+/youtube/v3/ plus transcripts under /transcript/<video id>, all from fixture
+files, with configurable latency, page size and error injection. Point the app
+at it with YOUTUBE_API_URL / TRANSCRIPT_API_URL (or batch.py --api-url /
+--transcript-url) to exercise fetching, concurrency and caching offline.
+
+Fixture layout (one JSON file per resource):
+
+    fixtures/videos/<video id>.json               videos.list item
+    fixtures/comments/<video id>.json             list of commentThreads items
+    fixtures/playlists/<playlist id>.json         list of playlistItems items
+    fixtures/channels/<channel id or @handle>.json  channels.list item
+    fixtures/transcripts/<video id>.<lang>.json   list of {text, start, duration}
+
+    python standin.py --fixtures fixtures --latency-ms 80 --error-rate 0.02
+    python standin.py --fixtures fixtures --record --api-key KEY   # capture misses from the real API once
+    python standin.py --synthetic                                  # generated data for any ID
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+from urllib.request import urlopen
+from fetchlayer import TRANSCRIPT_MISSING
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+UPSTREAM_URL = "https://www.googleapis.com/youtube/v3"
+# API maximum for maxResults on each endpoint
+MAX_RESULTS = {"videos": 50, "commentThreads": 100, "playlistItems": 50, "channels": 50}
+# Injectable failures, shaped like the API's error responses
+ERRORS = {
+    "quota": (403, "quotaExceeded", "The request cannot be completed because you have exceeded your quota."),
+    "rate": (403, "rateLimitExceeded", "The request rate is higher than allowed."),
+    "backend": (500, "backendError", "Backend Error"),
+    "unavailable": (503, "backendError", "The service is currently unavailable."),
+}
+
+class FixtureStore:
+    """Read and write fixture files; thread-safe for concurrent recording"""
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def path(self, kind, name):
+        return os.path.join(self.root, kind, f"{quote(name, safe='')}.json")
+
+    def load(self, kind, name):
+        try:
+            with open(self.path(kind, name), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, kind, name, value):
+        path = self.path(kind, name)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp, path)
+
+# Reason given for an upstream 403/404 whose body names none
+MISSING_REASONS = {"videos": "videoNotFound", "commentThreads": "commentsDisabled", "playlistItems": "playlistNotFound",
+                   "channels": "channelNotFound", "transcript": "transcriptNotFound"}
+
+class UpstreamError(Exception):
+    """An error response from the real service, passed on to the client as-is"""
+    def __init__(self, code, reason, message):
+        super().__init__(message)
+        self.code = code
+        self.reason = reason
+
+class Recorder:
+    """Fetch missing fixtures from the real services (record mode)"""
+    def __init__(self, api_key, max_comments=1000):
+        self.api_key = api_key
+        self.max_comments = max_comments
+
+    def call(self, endpoint, **params):
+        params["key"] = self.api_key
+        try:
+            with urlopen(f"{UPSTREAM_URL}/{endpoint}?{urlencode(params)}", timeout=30) as resp:
+                return json.load(resp)
+        except HTTPError as e:
+            try:
+                error = json.load(e)["error"]
+                reason, message = error["errors"][0]["reason"], error.get("message", "")
+            except (ValueError, KeyError, IndexError, TypeError):
+                reason, message = MISSING_REASONS[endpoint] if e.code in (403, 404) else "backendError", str(e)
+            raise UpstreamError(e.code, reason, message) from e
+
+    def paged(self, endpoint, limit, **params):
+        items, token = [], None
+        while len(items) < limit:
+            if token:
+                params["pageToken"] = token
+            data = self.call(endpoint, **params)
+            items.extend(data.get("items", []))
+            token = data.get("nextPageToken")
+            if not token:
+                break
+        return items[:limit]
+
+    def videos(self, ids):
+        data = self.call("videos", part="snippet,statistics,contentDetails", id=",".join(ids))
+        return {item["id"]: item for item in data.get("items", [])}
+
+    def comments(self, vid):
+        return self.paged("commentThreads", self.max_comments, part="snippet", videoId=vid,
+                          maxResults=100, order="relevance")
+
+    def channel(self, params):
+        data = self.call("channels", part="contentDetails", **params)
+        return data["items"][0] if data.get("items") else None
+
+    def playlist(self, pid):
+        return self.paged("playlistItems", 20000, part="snippet,contentDetails", playlistId=pid, maxResults=50)
+
+    def transcript(self, vid, lang):
+        from youtube_transcript_api import YouTubeTranscriptApi
+        try:
+            # Both the 0.x class method and the 1.x instance API, as in app.download_transcript
+            if hasattr(YouTubeTranscriptApi, "get_transcript"):
+                return YouTubeTranscriptApi.get_transcript(vid, languages=[lang])
+            return YouTubeTranscriptApi().fetch(vid, languages=[lang]).to_raw_data()
+        except Exception as e:
+            if type(e).__name__ in TRANSCRIPT_MISSING:
+                raise UpstreamError(404, "transcriptNotFound", f"No {lang} transcript for {vid}: {type(e).__name__}") from e
+            raise
+
+SYNTHETIC_WORDS = ("so today we look at how this works and why it matters for everyone who watches the "
+                   "channel it is great but the ending was a bit sad we also talk about the news and the game").split()
+SYNTHETIC_COMMENTS = ["love this video", "worst thing I have ever watched", "ok", "great explanation, thanks!",
+                      "this is so boring", "first", "amazing work :)", "not bad at all", "lol", "this made my day"]
+
+class SyntheticData:
+    """Deterministic generated resources for any ID, for load tests without recordings"""
+    def rng(self, *key):
+        return random.Random(":".join(key))
+
+    def video(self, vid):
+        rng = self.rng("video", vid)
+        minutes, seconds = rng.randint(1, 59), rng.randint(0, 59)
+        published = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(rng.randint(1300000000, 1700000000)))
+        return {
+            "kind": "youtube#video", "id": vid,
+            "snippet": {"title": f"Synthetic video {vid}", "channelTitle": f"Channel {vid[:3]}",
+                        "channelId": f"UC{vid[:3]}synthetic", "publishedAt": published},
+            "statistics": {"viewCount": str(rng.randint(0, 10**7)), "likeCount": str(rng.randint(0, 10**5)),
+                           "commentCount": str(rng.randint(0, 1500))},
+            "contentDetails": {"duration": f"PT{minutes}M{seconds}S", "contentRating": {}},
+        }
+
+    def comments(self, vid):
+        rng = self.rng("comments", vid)
+        n = int(self.video(vid)["statistics"]["commentCount"])
+        items = []
+        for i in range(n):
+            text = " ".join(rng.choices(SYNTHETIC_COMMENTS, k=rng.randint(1, 3)))
+            published = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1600000000 + (n - i) * 3600))
+            items.append({"kind": "youtube#commentThread", "id": f"{vid}.c{i}", "snippet": {
+                "videoId": vid, "topLevelComment": {"id": f"{vid}.c{i}", "snippet": {
+                    "textDisplay": text, "textOriginal": text, "publishedAt": published}}}})
+        return items
+
+    def channel(self, ref):
+        cid = ref if ref.startswith("UC") else "UC" + format(random.Random(ref).getrandbits(128), "032x")[:22]
+        return {"kind": "youtube#channel", "id": cid,
+                "contentDetails": {"relatedPlaylists": {"uploads": "UU" + cid[2:], "likes": ""}}}
+
+    def playlist(self, pid):
+        rng = self.rng("playlist", pid)
+        chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_"
+        items = []
+        for i in range(rng.randint(5, 200)):
+            vid = "".join(rng.choices(chars, k=11))
+            items.append({"kind": "youtube#playlistItem", "id": f"{pid}.{i}",
+                          "snippet": {"playlistId": pid, "position": i, "resourceId": {"videoId": vid}},
+                          "contentDetails": {"videoId": vid}})
+        return items
+
+    def transcript(self, vid, lang):
+        rng = self.rng("transcript", vid, lang)
+        segments, start = [], 0.0
+        for _ in range(rng.randint(50, 2000)):
+            duration = round(rng.uniform(1.5, 6.0), 2)
+            text = " ".join(rng.choices(SYNTHETIC_WORDS, k=rng.randint(4, 12))) + "."
+            segments.append({"text": text, "start": round(start, 2), "duration": duration})
+            start += duration
+        return segments
+
+class StandIn:
+    """Request handling shared by all server threads"""
+    def __init__(self, fixtures, latency_ms=0, jitter_ms=0, error_rate=0.0, errors=("backend",),
+                 page_size=None, recorder=None, synthetic=False, seed=None):
+        self.store = FixtureStore(fixtures)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.errors = list(errors)
+        self.page_size = page_size
+        self.recorder = recorder
+        self.synthetic = SyntheticData() if synthetic else None
+        self.rng = random.Random(seed)
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def resource(self, kind, name, record, generate):
+        """Fixture, else a recording, else synthetic data; None if unavailable"""
+        value = self.store.load(kind, name)
+        if value is None and self.recorder:
+            value = record()
+            if value is not None:
+                self.store.save(kind, name, value)
+                self.count(f"recorded.{kind}")
+        if value is None and self.synthetic:
+            value = generate()
+        return value
+
+    def injected_error(self):
+        with self._lock:
+            if not self.error_rate or self.rng.random() >= self.error_rate:
+                return None
+            return self.rng.choice(self.errors)
+
+    def delay(self):
+        if self.latency or self.jitter:
+            time.sleep(max(self.latency + self.rng.uniform(-self.jitter, self.jitter), 0))
+
+    def page(self, items, params, endpoint, kind):
+        """Slice items into the page selected by maxResults/pageToken (the token is an offset)"""
+        size = min(int(params.get("maxResults", 5)), MAX_RESULTS[endpoint], self.page_size or MAX_RESULTS[endpoint])
+        offset = int(params.get("pageToken") or 0)
+        body = {"kind": kind, "items": items[offset:offset + size],
+                "pageInfo": {"totalResults": len(items), "resultsPerPage": size}}
+        if offset + size < len(items):
+            body["nextPageToken"] = str(offset + size)
+        return body
+
+    def videos(self, params):
+        ids = [v for v in params.get("id", "").split(",") if v]
+        items = {vid: self.store.load("videos", vid) for vid in ids}
+        missing = [vid for vid, item in items.items() if item is None]
+        if missing and self.recorder:
+            for vid, item in self.recorder.videos(missing).items():
+                self.store.save("videos", vid, item)
+                items[vid] = item
+                self.count("recorded.videos")
+        if self.synthetic:
+            items = {vid: item or self.synthetic.video(vid) for vid, item in items.items()}
+        # Unknown IDs are silently left out, as the real API does
+        return 200, self.page([item for item in items.values() if item], {"maxResults": 50},
+                              "videos", "youtube#videoListResponse")
+
+    def comment_threads(self, params):
+        vid = params.get("videoId", "")
+        items = self.resource("comments", vid, lambda: self.recorder.comments(vid),
+                              lambda: self.synthetic.comments(vid))
+        if items is None:
+            return error_body(404, "videoNotFound", "The video identified by the videoId parameter could not be found.")
+        if params.get("order") == "time":
+            items = sorted(items, key=lambda c: c["snippet"]["topLevelComment"]["snippet"].get("publishedAt", ""),
+                           reverse=True)
+        return 200, self.page(items, params, "commentThreads", "youtube#commentThreadListResponse")
+
+    def playlist_items(self, params):
+        pid = params.get("playlistId", "")
+        items = self.resource("playlists", pid, lambda: self.recorder.playlist(pid),
+                              lambda: self.synthetic.playlist(pid))
+        if items is None:
+            return error_body(404, "playlistNotFound", "The playlist identified by the playlistId parameter cannot be found.")
+        return 200, self.page(items, params, "playlistItems", "youtube#playlistItemListResponse")
+
+    def channels(self, params):
+        ref = params.get("id") or params.get("forHandle", "")
+        lookup = {"id": ref} if params.get("id") else {"forHandle": ref}
+        item = self.resource("channels", ref, lambda: self.recorder.channel(lookup),
+                             lambda: self.synthetic.channel(ref))
+        # An unknown channel is an empty result, not an error
+        return 200, self.page([item] if item else [], {"maxResults": 50}, "channels", "youtube#channelListResponse")
+
+    def transcript(self, vid, params):
+        lang = params.get("lang", "en")
+        segments = self.resource("transcripts", f"{vid}.{lang}", lambda: self.recorder.transcript(vid, lang),
+                                 lambda: self.synthetic.transcript(vid, lang))
+        if segments is None:
+            return error_body(404, "transcriptNotFound", f"No {lang} transcript for {vid}")
+        return 200, segments
+
+    def handle(self, path, params):
+        """(status, JSON body) for one GET request"""
+        if path == "/_stats":
+            with self._lock:
+                return 200, dict(self.counts)
+        routes = {"/youtube/v3/videos": self.videos, "/youtube/v3/commentThreads": self.comment_threads,
+                  "/youtube/v3/playlistItems": self.playlist_items, "/youtube/v3/channels": self.channels}
+        if path in routes:
+            endpoint, handler = path.rsplit("/", 1)[1], routes[path]
+        elif path.startswith("/transcript/"):
+            vid = path[len("/transcript/"):]
+            endpoint, handler = "transcript", lambda p: self.transcript(vid, p)
+        else:
+            return error_body(404, "notFound", f"Unknown path {path}")
+        self.count(f"requests.{endpoint}")
+        self.delay()
+        injected = self.injected_error()
+        if injected:
+            self.count(f"errors.{injected}")
+            return error_body(*ERRORS[injected])
+        try:
+            return handler(params)
+        except UpstreamError as e:
+            # Passed on with the upstream status and reason, so missing or disabled resources stay
+            # not_found for the fetch layer; only the stand-in's own failures become 500s
+            logger.warning(f"Upstream {e.code} {e.reason} on {path}: {e}")
+            return error_body(e.code, e.reason, str(e))
+        except Exception as e:
+            logger.error(f"Stand-in failed on {path}: {e}")
+            return error_body(500, "backendError", str(e))
+
+def error_body(code, reason, message):
+    return code, {"error": {"code": code, "message": message, "errors": [{"reason": reason, "message": message}]}}
+
+class Handler(BaseHTTPRequestHandler):
+    standin = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        status, body = self.standin.handle(url.path, params)
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+def make_server(standin, host="127.0.0.1", port=8765):
+    handler = type("StandInHandler", (Handler,), {"standin": standin})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def start_in_background(standin, host="127.0.0.1", port=0):
+    """Serve from a daemon thread; returns (server, base URL). Port 0 picks a free port."""
+    server = make_server(standin, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default="fixtures", help="fixture directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="added delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random +/- variation of the delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--errors", default="backend", help=f"comma-separated kinds to inject: {', '.join(ERRORS)}")
+    parser.add_argument("--page-size", type=int, help="cap results per page below the API maximum")
+    parser.add_argument("--seed", type=int, help="seed for latency jitter and error injection")
+    parser.add_argument("--synthetic", action="store_true", help="generate data for IDs without fixtures")
+    parser.add_argument("--record", action="store_true", help="fetch missing fixtures from the real services")
+    parser.add_argument("--api-key", default=os.getenv("YOUTUBE_API_KEY"), help="API key for --record")
+    parser.add_argument("--record-max-comments", type=int, default=1000)
+    args = parser.parse_args()
+
+    errors = [e.strip() for e in args.errors.split(",") if e.strip()]
+    unknown = [e for e in errors if e not in ERRORS]
+    if unknown:
+        parser.error(f"unknown error kinds: {', '.join(unknown)}")
+    if args.record and not args.api_key:
+        parser.error("--record needs --api-key (or YOUTUBE_API_KEY)")
+    recorder = Recorder(args.api_key, args.record_max_comments) if args.record else None
+    standin = StandIn(args.fixtures, args.latency_ms, args.jitter_ms, args.error_rate, errors,
+                      args.page_size, recorder, args.synthetic, args.seed)
+    server = make_server(standin, args.host, args.port)
+    logger.info(f"Stand-in serving {args.fixtures} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
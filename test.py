@@ -1,35 +1,28 @@
-import pandas as pd
-from sklearn.metrics import confusion_matrix, classification_report
+import sys
+import json
 import matplotlib.pyplot as plt
-import re
-
-# Step 1: Load your test results CSV
-csv_path = 'youtube_video_classification.csv'  # Update this path if needed
-df = pd.read_csv(csv_path)
-
-# Step 2: Convert categorical labels to binary format
-label_map = {'Safe': 0, 'Restricted': 1}
-df['Actual Label'] = df['Actual Label'].map(label_map)
-df['Predicted Label'] = df['Predicted Label'].map(label_map)
-
-# Step 3: Extract actual and predicted labels
-y_true = df['Actual Label']
-y_pred = df['Predicted Label']
-
-# Step 4: Calculate performance metrics
-conf_matrix = confusion_matrix(y_true, y_pred)
-report = classification_report(y_true, y_pred, target_names=['Safe', 'Restricted'])
-
-print("✅ Confusion Matrix:\n", conf_matrix)
-print("\n📊 Classification Report:\n", report)
-
-# Step 5: Parse the classification report for metrics
-accuracy = float(re.findall(r'accuracy\s+([\d.]+)', report)[0]) * 100
-precision = float(re.findall(r'weighted avg\s+[\d.]+\s+[\d.]+\s+([\d.]+)', report)[0]) * 100
-recall = float(re.findall(r'weighted avg\s+[\d.]+\s+([\d.]+)', report)[0]) * 100
-f1_score = float(re.findall(r'weighted avg\s+([\d.]+)', report)[0]) * 100
-
-# Step 6: Bar chart visualization
+from evaluate import score_predictions, format_report
+
+# Step 1: Load results - an evaluate.py results file, or the predictions saved in a CSV
+path = sys.argv[1] if len(sys.argv) > 1 else 'youtube_video_classification.csv'
+if path.endswith('.json'):
+    with open(path, encoding='utf-8') as f:
+        results = json.load(f)
+else:
+    results = score_predictions(path)
+
+# Step 2: Metrics come straight from the confusion matrix
+print("✅ Confusion Matrix (rows actual, columns predicted; Safe / Restricted):\n", results['confusion_matrix'])
+print("\n📊 Classification Report:\n", format_report(results))
+
+# Step 3: Overall scores (precision, recall and F1 weighted by class support)
+weighted = results['weighted_avg']
+accuracy = results['accuracy'] * 100
+precision = weighted['precision'] * 100
+recall = weighted['recall'] * 100
+f1_score = weighted['f1'] * 100
+
+# Step 4: Bar chart visualization
 metrics = ['Accuracy', 'Precision', 'Recall', 'F1-Score']
 scores = [accuracy, precision, recall, f1_score]
 colors = ['skyblue', 'lightgreen', 'salmon', 'orchid']
@@ -0,0 +1,81 @@
+"""Place restricted-content hits in the joined transcript on the video timeline.
+
+The transcript text is " ".join of the segment texts, so a prefix-offset array
+over the segments maps any character offset back to its segment (and its start
+time) with a binary search. All hits are mapped at once, bucketed into fixed
+windows with bincount, and consecutive flagged windows are merged into ranges.
+"""
+import numpy as np
+from transcript import Transcript
+
+WINDOW_SECONDS = 30
+
+class TranscriptIndex:
+    """Segment start times and the offset where each segment begins in the joined, lowered text"""
+    def __init__(self, transcript):
+        if not isinstance(transcript, Transcript):
+            transcript = Transcript.from_segments(transcript)
+        n = len(transcript)
+        self.starts = transcript.starts
+        self.end = float((transcript.starts + transcript.durations).max()) if n else 0.0
+        if transcript.text.isascii():
+            self.offsets = transcript.offsets
+        else:
+            # The scanners report offsets into text.lower(), which can be longer (e.g. "İ")
+            lengths = np.fromiter((len(transcript.segment_text(i).lower()) for i in range(n)), dtype=np.int64, count=n)
+            self.offsets = np.zeros(n, dtype=np.int64)
+            np.cumsum(lengths[:-1] + 1, out=self.offsets[1:])  # +1 for the joining space
+
+    def segments_at(self, offsets):
+        """Segment index containing each character offset"""
+        return np.maximum(np.searchsorted(self.offsets, offsets, side="right") - 1, 0)
+
+    def times_at(self, offsets):
+        return self.starts[self.segments_at(offsets)]
+
+def flagged_ranges(index, matches, labels, profanity_positions=(), window=WINDOW_SECONDS, profanity_threshold=1):
+    """Time ranges containing restricted keywords or profanity.
+
+    matches are (pattern index, start, end) from RestrictedContentMatcher.scan and
+    profanity_positions are (start, end) from ProfanityScorer.positions, both offsets
+    into the lowered joined text. A window is flagged when it holds any keyword hit
+    or at least profanity_threshold profane words; adjacent flagged windows merge.
+    Returns [{start, end, keywords, keyword_hits, profanity}], times in seconds.
+    """
+    if len(index.starts) == 0 or not (len(matches) or len(profanity_positions)):
+        return []
+    n_labels = len(labels)
+    kw = np.asarray(matches, dtype=np.int64).reshape(-1, 3)
+    prof = np.asarray(profanity_positions, dtype=np.int64).reshape(-1, 2)
+    kw_win = (index.times_at(kw[:, 1]) // window).astype(np.int64)
+    prof_win = (index.times_at(prof[:, 0]) // window).astype(np.int64)
+    n_windows = int(max(kw_win.max(initial=0), prof_win.max(initial=0))) + 1
+    # Hits per (window, pattern) in one bincount
+    per_label = np.bincount(kw_win * n_labels + kw[:, 0], minlength=n_windows * n_labels).reshape(n_windows, n_labels)
+    kw_hits = per_label.sum(axis=1)
+    profanity = np.bincount(prof_win, minlength=n_windows)
+    flagged = (kw_hits > 0) | (profanity >= profanity_threshold)
+
+    ranges = []
+    # Runs of consecutive flagged windows: boundaries where the flag changes
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], flagged.astype(np.int8), [0]))))
+    for first, stop in zip(edges[::2], edges[1::2]):
+        found = per_label[first:stop].sum(axis=0)
+        ranges.append({
+            "start": float(first * window),
+            "end": float(min(stop * window, max(index.end, first * window))),
+            "keywords": [labels[i] for i in np.flatnonzero(found)],
+            "keyword_hits": int(kw_hits[first:stop].sum()),
+            "profanity": int(profanity[first:stop].sum()),
+        })
+    return ranges
+
+def format_range(r):
+    """"mm:ss-mm:ss (labels)" for display and CSV output"""
+    def clock(seconds):
+        sec = int(seconds)
+        return f"{sec // 3600}:{sec % 3600 // 60:02d}:{sec % 60:02d}" if sec >= 3600 else f"{sec // 60:02d}:{sec % 60:02d}"
+    reasons = list(r["keywords"])
+    if r["profanity"]:
+        reasons.append(f"profanity x{r['profanity']}")
+    return f"{clock(r['start'])}-{clock(r['end'])} ({', '.join(reasons)})"
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Tracked videos: re-check a watchlist and only process what changed since the last run.
+
+Each tracked video keeps its state in a small SQLite file: the newest comment
+seen (ID and publish time), running comment sentiment counts, a hash of the
+transcript with the transcript classification made from it, and the previous
+verdict. A refresh pages through comments newest first (order=time) and stops at
+the first one already counted, so its cost grows with the number of new
+comments, not with the video's history. The new comments' sentiment is added
+to the saved counts. The transcript is downloaded fresh, not from the fetch cache,
+and only rescanned when its hash changed.
+Deleted or edited comments are not subtracted; remove and re-add a video to
+recount from scratch.
+
+    python tracking.py add https://youtu.be/VIDEO_ID ...
+    python tracking.py refresh                 # every tracked video
+    python tracking.py list
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cache import configure_cache
+from fetchlayer import FetchError
+from app import (get_video_id, get_playlist_id, fetch_video_stats, fetch_transcript, classify_transcript,
+                 restriction_verdict, blocklist_reasons, iter_comment_items, comment_text, analyze_sentiment,
+                 configure_endpoints, configure_quota, MAX_COMMENTS)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "youtube_analyzer", "tracked.sqlite3")
+
+def new_state(url, lang="en"):
+    return {
+        "video_id": get_video_id(url),
+        "url": url,
+        "lang": lang,
+        "added": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "checked": None,
+        "last_comment_id": None,
+        "last_comment_at": None,
+        "boundary_ids": [],  # comments published exactly at last_comment_at, already counted
+        "comments": 0,
+        "sentiment": {"Positive": 0, "Negative": 0, "Neutral": 0},
+        "transcript_hash": None,
+        "transcript": None,  # summary of the transcript classification for transcript_hash
+        "classification": None,
+        "sources": [],
+    }
+
+class TrackedStore:
+    """Tracked-video state in SQLite, one JSON document per video"""
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS tracked (video_id TEXT PRIMARY KEY, state TEXT NOT NULL)")
+        return self._conn
+
+    def get(self, vid):
+        with self._lock:
+            row = self._connect().execute("SELECT state FROM tracked WHERE video_id=?", (vid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, state):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO tracked VALUES (?, ?)", (state["video_id"], json.dumps(state)))
+            conn.commit()
+
+    def remove(self, vid):
+        with self._lock:
+            conn = self._connect()
+            removed = conn.execute("DELETE FROM tracked WHERE video_id=?", (vid,)).rowcount
+            conn.commit()
+        return bool(removed)
+
+    def all(self):
+        with self._lock:
+            rows = self._connect().execute("SELECT state FROM tracked ORDER BY video_id").fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+def transcript_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def new_comments(state, max_comments=MAX_COMMENTS):
+    """Texts of comments published since the last refresh, newest first, and the new comment cursor.
+
+    Pages are requested one at a time (order=time), stopping at the first comment already
+    counted. max_comments caps how far back the first refresh goes.
+    """
+    last_at, boundary = state["last_comment_at"], set(state["boundary_ids"])
+    texts, cursor = [], None
+    budget = max_comments if last_at is None else None
+    try:
+        for items in iter_comment_items(state["video_id"], budget, None, order="time", prefetch=False):
+            done = False
+            for item in items:
+                published = item["snippet"]["topLevelComment"]["snippet"]["publishedAt"]
+                if last_at is not None:
+                    # Comments sharing the last timestamp may come in any order, so the scan
+                    # only stops at an older one and skips those already counted
+                    if published < last_at:
+                        done = True
+                        break
+                    if published == last_at and item["id"] in boundary:
+                        continue
+                if cursor is None:
+                    cursor = {"id": item["id"], "at": published, "boundary": []}
+                if published == cursor["at"]:
+                    cursor["boundary"].append(item["id"])
+                texts.append(comment_text(item))
+            if done:
+                break
+    except FetchError as e:
+        if e.kind != "not_found":
+            raise
+        logger.info(f"No comments for video {state['video_id']}: {e.cause}")
+    return texts, cursor
+
+def refresh(state, max_comments=MAX_COMMENTS):
+    """Bring one video's state up to date; returns (new state, summary of what changed)"""
+    state = dict(state)
+    vid = state["video_id"]
+    stats = fetch_video_stats(vid)
+    if not stats:
+        return state, {"video_id": vid, "status": "unavailable"}
+    # Comments: only those newer than the saved cursor, folded into the running counts
+    texts, cursor = new_comments(state, max_comments)
+    if texts:
+        added = analyze_sentiment(texts)
+        state["sentiment"] = {k: state["sentiment"].get(k, 0) + n for k, n in added.items()}
+        state["comments"] += len(texts)
+    if cursor:
+        if cursor["at"] == state["last_comment_at"]:
+            cursor["boundary"] += state["boundary_ids"]
+        state.update(last_comment_id=cursor["id"], last_comment_at=cursor["at"], boundary_ids=cursor["boundary"])
+    # Transcript: rescanned only when its content changed. The cached copy is kept for 30 days,
+    # so it is fetched fresh (and the cache entry replaced) to notice edits
+    text, data = fetch_transcript(vid, state["lang"], refresh=True)
+    digest = transcript_hash(text) if text else None
+    transcript_changed = digest != state["transcript_hash"]
+    if transcript_changed:
+        analysis = classify_transcript(text, data) if text else None
+        state["transcript_hash"] = digest
+        state["transcript"] = {key: analysis[key] for key in ("age_restricted", "restricted_keywords",
+                                                               "profanity_score", "timeline")} if analysis else None
+    transcript = state["transcript"]
+    is_res, reasons = restriction_verdict(vid, stats, get_playlist_id(state["url"]),
+                                          bool(transcript and transcript["age_restricted"]))
+    sources = blocklist_reasons(reasons)
+    previous = state["classification"]
+    state.update(title=stats["title"], channel=stats["channel"], sources=sources,
+                 age_restricted_by_youtube=stats.get("age_restricted_by_youtube", False),
+                 classification="Restricted" if is_res else "Safe",
+                 checked=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+    return state, {
+        "video_id": vid,
+        "status": "ok",
+        "title": stats["title"],
+        "new_comments": len(texts),
+        "comments": state["comments"],
+        "sentiment": state["sentiment"],
+        "transcript_changed": transcript_changed,
+        "classification": state["classification"],
+        "previous_classification": previous,
+        "classification_changed": previous is not None and previous != state["classification"],
+    }
+
+def refresh_all(store, vids=None, concurrency=4, max_comments=MAX_COMMENTS):
+    """Refresh the given (default: all) tracked videos concurrently; yields each summary as it finishes"""
+    states = store.all() if not vids else [s for s in map(store.get, vids) if s]
+
+    def run(state):
+        try:
+            new, summary = refresh(state, max_comments)
+        except Exception as e:
+            # The saved state is left as it was, so the next refresh retries the same delta
+            logger.error(f"Failed to refresh {state['video_id']}: {e}")
+            return {"video_id": state["video_id"], "status": "error", "error": str(e)}
+        store.put(new)
+        return summary
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in as_completed([pool.submit(run, state) for state in states]):
+            yield future.result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Track videos and re-analyze only what changed since the last refresh")
+    parser.add_argument("--state", default=os.getenv("YTA_TRACKED_PATH", DEFAULT_PATH), help="tracked-video state file")
+    parser.add_argument("--api-url", help="YouTube Data API base URL (e.g. the local stand-in, standin.py)")
+    parser.add_argument("--transcript-url", help="transcript provider base URL (e.g. the local stand-in)")
+    parser.add_argument("--daily-quota", type=int, help="pace API calls to this many quota units per day")
+    parser.add_argument("--cache-path", help="fetch cache file (default: ~/.cache/youtube_analyzer/cache.sqlite3)")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the fetch cache")
+    parser.add_argument("--refresh-cache", action="store_true", help="refetch everything and overwrite cached entries")
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="start tracking videos")
+    add.add_argument("urls", nargs="+")
+    add.add_argument("--lang", default="en", help="transcript language")
+    remove = sub.add_parser("remove", help="stop tracking videos")
+    remove.add_argument("urls", nargs="+")
+    sub.add_parser("list", help="show tracked videos and their last results")
+    ref = sub.add_parser("refresh", help="fetch new comments and changed transcripts")
+    ref.add_argument("urls", nargs="*", help="videos to refresh (default: all tracked)")
+    ref.add_argument("-c", "--concurrency", type=int, default=4, help="videos refreshed at once")
+    ref.add_argument("--max-comments", type=int, default=MAX_COMMENTS,
+                     help="comments counted on a video's first refresh (later refreshes take every new one)")
+    ref.add_argument("-o", "--output", help="append each refresh summary as a JSON line")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:%(message)s")
+    configure_cache(enabled=not args.no_cache, refresh=args.refresh_cache, path=args.cache_path)
+    configure_endpoints(args.api_url, args.transcript_url)
+    configure_quota(args.daily_quota)
+    store = TrackedStore(args.state)
+
+    if args.command == "add":
+        for url in args.urls:
+            state = new_state(url, args.lang)
+            if not state["video_id"]:
+                logger.error(f"Invalid YouTube URL: {url}")
+            elif store.get(state["video_id"]):
+                logger.info(f"Already tracking {state['video_id']}")
+            else:
+                store.put(state)
+                logger.info(f"Tracking {state['video_id']}")
+    elif args.command == "remove":
+        for url in args.urls:
+            vid = get_video_id(url)
+            if not (vid and store.remove(vid)):
+                logger.error(f"Not tracked: {url}")
+    elif args.command == "list":
+        for s in store.all():
+            print(f"{s['video_id']}  {s['classification'] or '-':<10}  {s['comments']:>7} comments  "
+                  f"checked {s['checked'] or 'never'}  {s.get('title', '')}")
+    else:
+        vids = [get_video_id(u) for u in args.urls]
+        out = open(args.output, "a", encoding="utf-8") if args.output else None
+        failed = 0
+        try:
+            for summary in refresh_all(store, vids, args.concurrency, args.max_comments):
+                failed += summary["status"] == "error"
+                if out:
+                    out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+                if summary["status"] == "ok":
+                    flag = "  CHANGED" if summary["classification_changed"] else ""
+                    print(f"{summary['video_id']}  {summary['classification']:<10}{flag}  +{summary['new_comments']} comments "
+                          f"({summary['comments']} total)  transcript {'rescanned' if summary['transcript_changed'] else 'unchanged'}")
+                else:
+                    print(f"{summary['video_id']}  {summary['status']}  {summary.get('error', '')}")
+        finally:
+            if out:
+                out.close()
+            store.close()
+        sys.exit(1 if failed else 0)
+    store.close()
+
+if __name__ == "__main__":
+    main()
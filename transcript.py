@@ -0,0 +1,92 @@
+"""Compact transcripts: one text buffer and NumPy columns instead of a dict per segment.
+
+The segment texts live in a single string, " ".join of the segments as from
+fetch_transcript, so the joined text costs nothing extra. Segment i spans
+text[bounds[i]:bounds[i + 1] - 1] (the -1 drops the joining space) and its
+timing is in the starts and durations columns. Slicing, by index or by time
+with between(), shares the buffer and takes views of the columns, so no
+segment text is copied until it is asked for.
+"""
+import numpy as np
+
+class Transcript:
+    """Transcript segments; indexing with an int gives a {'text', 'start', 'duration'} dict like the raw segments"""
+    __slots__ = ("buffer", "bounds", "starts", "durations")
+
+    def __init__(self, buffer, bounds, starts, durations):
+        self.buffer = buffer
+        self.bounds = bounds
+        self.starts = starts
+        self.durations = durations
+
+    @classmethod
+    def from_segments(cls, segments):
+        """From the provider's list of {'text', 'start', 'duration'} dicts"""
+        n = len(segments)
+        texts = [e['text'] for e in segments]
+        bounds = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=n) + 1, out=bounds[1:])
+        return cls(" ".join(texts),
+                   bounds,
+                   np.fromiter((e['start'] for e in segments), dtype=np.float64, count=n),
+                   np.fromiter((e.get('duration', 0) for e in segments), dtype=np.float64, count=n))
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def offsets(self):
+        """Where each segment begins in text"""
+        return self.bounds[:-1] - self.bounds[0]
+
+    @property
+    def text(self):
+        """The segments joined with spaces; the buffer itself (no copy) for a whole transcript"""
+        if not len(self):
+            return ""
+        return self.buffer[self.bounds[0]:self.bounds[-1] - 1]
+
+    def segment_text(self, i):
+        return self.buffer[self.bounds[i]:self.bounds[i + 1] - 1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                raise ValueError("Transcript slices must be contiguous")
+            stop = max(stop, start)
+            return Transcript(self.buffer, self.bounds[start:stop + 1], self.starts[start:stop],
+                              self.durations[start:stop])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("segment index out of range")
+        return {'text': self.segment_text(i), 'start': float(self.starts[i]), 'duration': float(self.durations[i])}
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def between(self, t0, t1):
+        """Segments playing between t0 and t1 seconds, sharing this transcript's storage"""
+        first = int(np.searchsorted(self.starts, t0, side="right")) - 1
+        if first < 0 or self.starts[first] + self.durations[first] <= t0:
+            first += 1
+        stop = int(np.searchsorted(self.starts, t1, side="left"))
+        return self[first:stop]
+
+    def to_segments(self):
+        """The raw list of dicts, e.g. for JSON"""
+        return list(self)
+
+    def write_to(self, f, chunk=1000):
+        """Write "[mm:ss] text" blocks to a text file, chunk segments per write"""
+        buf = self.buffer
+        for first in range(0, len(self), chunk):
+            secs = self.starts[first:first + chunk].astype(np.int64).tolist()
+            bounds = self.bounds[first:first + chunk + 1].tolist()
+            f.write("".join(f"[{sec // 60:02d}:{sec % 60:02d}] {buf[a:b - 1]}\n\n"
+                            for sec, a, b in zip(secs, bounds, bounds[1:])))
+
+    def __repr__(self):
+        return f"<Transcript {len(self)} segments, {len(self.text)} chars>"
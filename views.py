@@ -0,0 +1,160 @@
+"""Windowed Tk views for long transcripts and sentence tables.
+
+Only a page of rows is put into the widget at first; more pages are added as the
+user scrolls towards either end. Search and jump-to-timestamp work on the
+underlying data and re-render just the window around the target row.
+"""
+import bisect
+import re
+import tkinter as tk
+from transcript import Transcript
+
+def format_timestamp(seconds):
+    sec = int(seconds)
+    return f"[{sec//60:02d}:{sec%60:02d}]"
+
+def parse_timestamp(value):
+    """Seconds from "ss", "mm:ss" or "hh:mm:ss"; None if unparseable"""
+    if not re.fullmatch(r"\s*\d+(:\d{1,2}){0,2}\s*", value or ""):
+        return None
+    seconds = 0
+    for part in value.strip().split(":"):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+class TranscriptView:
+    """Render transcript segments into a tk.Text one page at a time.
+
+    segments is the transcript_data Transcript (a list of {'text', 'start', ...} dicts is converted).
+    """
+    def __init__(self, text, scrollbar, segments, page_size=200):
+        self.text = text
+        self.scrollbar = scrollbar
+        self.segments = segments if isinstance(segments, Transcript) else Transcript.from_segments(segments)
+        self.page_size = page_size
+        self.starts = self.segments.starts
+        self._lowered = None
+        self.first = self.last = 0
+        self.last_hit = -1
+        self._scheduled = False
+        text.config(yscrollcommand=self.on_scroll)
+        scrollbar.config(command=text.yview)
+        text.tag_configure("hit", background="#665500")
+        self.show_from(0)
+
+    def _insert(self, index, i):
+        start = self.text.index("end-1c") if index == tk.END else "1.0"
+        self.text.insert(index, f"{format_timestamp(self.starts[i])} ", "ts", f"{self.segments.segment_text(i)}\n\n", "tx")
+        # Marks keep right gravity, so text prepended later pushes them along with their segment
+        self.text.mark_set(f"seg{i}", start)
+
+    def show_from(self, index):
+        """Replace the widget contents with the page starting at segment index"""
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        for name in self.text.mark_names():
+            if name.startswith("seg"):
+                self.text.mark_unset(name)
+        self.first = self.last = index
+        self.text.config(state=tk.DISABLED)
+        self.append_page()
+        self.text.yview_moveto(0)
+
+    def append_page(self):
+        end = min(self.last + self.page_size, len(self.segments))
+        self.text.config(state=tk.NORMAL)
+        for i in range(self.last, end):
+            self._insert(tk.END, i)
+        self.text.config(state=tk.DISABLED)
+        self.last = end
+
+    def prepend_page(self):
+        start = max(self.first - self.page_size, 0)
+        anchor = f"seg{self.first}"
+        self.text.config(state=tk.NORMAL)
+        for i in range(self.first - 1, start - 1, -1):
+            self._insert("1.0", i)
+        self.text.config(state=tk.DISABLED)
+        self.first = start
+        # Keep the segment the user was looking at in place
+        self.text.yview(anchor)
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._scheduled:
+            return
+        if float(last) > 0.9 and self.last < len(self.segments):
+            self._scheduled = True
+            self.text.after_idle(self._load, self.append_page)
+        elif float(first) < 0.05 and self.first > 0:
+            self._scheduled = True
+            self.text.after_idle(self._load, self.prepend_page)
+
+    def _load(self, load_page):
+        self._scheduled = False
+        load_page()
+
+    def scroll_to(self, i):
+        if not (self.first <= i < self.last):
+            self.show_from(max(i - self.page_size // 4, 0))
+        self.text.yview(f"seg{i}")
+
+    def jump_to_time(self, seconds):
+        """Scroll to the segment playing at the given second"""
+        if not self.segments:
+            return
+        self.scroll_to(max(bisect.bisect_right(self.starts, seconds) - 1, 0))
+
+    def search(self, query):
+        """Highlight the next segment containing query (case-insensitive, wrapping); False if none"""
+        query = query.strip().lower()
+        if not query or not self.segments:
+            return False
+        if self._lowered is None:
+            self._lowered = [self.segments.segment_text(i).lower() for i in range(len(self.segments))]
+        n = len(self.segments)
+        for step in range(1, n + 1):
+            i = (self.last_hit + step) % n
+            if query in self._lowered[i]:
+                self.last_hit = i
+                self.scroll_to(i)
+                self.text.tag_remove("hit", "1.0", tk.END)
+                self.text.tag_add("hit", f"seg{i}", f"seg{i} lineend")
+                return True
+        return False
+
+class TableView:
+    """Feed rows into a ttk.Treeview a page at a time as the user scrolls towards the end.
+
+    columns are equal-length sequences (e.g. NumPy arrays); rows are sliced out of
+    them page by page, so nothing is materialized ahead of the scroll position.
+    formatters optionally maps a column index to a function applied to each value.
+    """
+    def __init__(self, tree, scrollbar, columns, formatters=None, page_size=500):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.columns = columns
+        self.formatters = formatters or {}
+        self.size = len(columns[0]) if columns else 0
+        self.page_size = page_size
+        self.loaded = 0
+        self._scheduled = False
+        tree.config(yscrollcommand=self.on_scroll)
+        scrollbar.config(command=tree.yview)
+        self.append_page()
+
+    def append_page(self):
+        self._scheduled = False
+        end = min(self.loaded + self.page_size, self.size)
+        page = [c[self.loaded:end] for c in self.columns]
+        for i, fmt in self.formatters.items():
+            page[i] = [fmt(v) for v in page[i]]
+        for row in zip(*page):
+            self.tree.insert('', tk.END, values=row)
+        self.loaded = end
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self._scheduled and float(last) > 0.9 and self.loaded < self.size:
+            self._scheduled = True
+            self.tree.after_idle(self.append_page)